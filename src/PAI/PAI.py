@@ -1,6 +1,9 @@
-﻿import json
+﻿import os
 import re
-from datetime import datetime
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import asdict, dataclass
+from datetime import datetime, timezone
 from pathlib import Path
 from typing import Optional, Dict, Any, List, Tuple
 from requests import HTTPError, ConnectionError, Timeout
@@ -9,18 +12,144 @@ from .models.model_registry import ProviderRegistry
 from .tools.tool_registry import ToolRegistry
 from .resources.resource_registry import ResourceRegistry
 from .contextmanager import ContextManager
-from .models.OpenAI_client import OpenAIClient
-from .models.Anthropic_client import AnthropicClient
-from .models.Huggingface_client import HuggingfaceClient
-from .models.Gemini_client import GeminiClient
-
-
-# Add more imports as you create providers:
-# from .models.huggingface_client import HuggingFaceClient
-# from .models.local_client import LocalClient
+from .cache import LLMCache
 
 from PAI.utils.logger import logger
 from PAI.utils.encrypt import encrypt_api_key, decrypt_api_key
+from PAI.utils.json_io import dumps, loads, JSONDecodeError
+from PAI.utils.background_writer import BackgroundWriter
+from PAI.utils.prompt_history import PromptHistory
+
+# Size of the window read from the end of the session log when looking for the
+# latest session instance. Doubled until a full line fits.
+_TAIL_WINDOW = 64 * 1024
+
+# Upper bound on threads used to run independent tool/resource requests
+_MAX_WORKERS = 8
+
+# Session log appends are written off the generate loop's critical path
+_SESSION_WRITER = BackgroundWriter()
+
+# Parsed session logs shared by every PAI in the process, keyed on the log path
+# and validated against the session/history file stat
+_SESSION_LOG_CACHE: Dict[Path, Tuple[Any, str, Dict[str, Any], Optional[str]]] = {}
+
+_SESSION_DT_FORMAT = "%Y-%m-%dT%H:%M:%S.%fZ"
+
+# Characters that matter when matching braces, outside and inside JSON strings
+_STRUCTURAL_CHAR = re.compile(r'[{}"]')
+_STRING_SPECIAL_CHAR = re.compile(r'["\\]')
+
+_STORES_LOADED = False
+
+_SESSION_DIR = Path.home() / ".PAI" / "PAI_session_logs"
+_SESSION_DIR_READY = False
+
+
+def _ensure_stores():
+    """Import the tool and resource stores once so their entries are registered."""
+    global _STORES_LOADED
+    if _STORES_LOADED:
+        return
+    try:
+        from .tools import tool_store
+        from .resources import resource_store
+
+        logger.debug("Stores ran")
+    except ImportError:
+        logger.warning("Failed to import stores")
+    _STORES_LOADED = True
+
+
+def _ensure_session_dir():
+    """Create the session log directory the first time a session is opened."""
+    global _SESSION_DIR_READY
+    if not _SESSION_DIR_READY:
+        _SESSION_DIR.mkdir(parents=True, exist_ok=True)
+        _SESSION_DIR_READY = True
+
+
+def _utc_timestamp() -> str:
+    """Current UTC time in the session log's ISO 8601 "Z" format."""
+    return datetime.now(timezone.utc).strftime(_SESSION_DT_FORMAT)
+
+
+def _iter_json_objects(text: str):
+    """
+    Yield each top-level, brace-balanced {...} span in text.
+
+    Braces inside JSON strings are ignored, so nested objects such as tool
+    "args" stay in one span. An unbalanced "{" in prose is skipped.
+    """
+    # One pass over the structural characters, jumping between them with
+    # compiled searches rather than stepping through every character in Python
+    opened: List[int] = []
+    # Spans closed while an earlier "{" was still open, which only count as
+    # top-level if that "{" turns out to be unbalanced
+    pending: List[Tuple[int, int]] = []
+    pos = text.find("{")
+    while pos != -1:
+        match = _STRUCTURAL_CHAR.search(text, pos)
+        if match is None:
+            break
+        c = match.group()
+        pos = match.end()
+        if c == '"':
+            if not opened:
+                # A quote in prose, outside any object
+                continue
+            # Skip the string literal, honoring backslash escapes
+            while True:
+                match = _STRING_SPECIAL_CHAR.search(text, pos)
+                if match is None:
+                    pos = -1
+                    break
+                if match.group() == '"':
+                    pos = match.end()
+                    break
+                pos = match.end() + 1
+        elif c == "{":
+            opened.append(match.start())
+        elif opened:
+            span = (opened.pop(), match.start())
+            if opened:
+                pending.append(span)
+            else:
+                pending.clear()
+                yield text[span[0] : span[1] + 1]
+
+    # Every "{" still open is unbalanced; yield the outermost spans inside them.
+    # Spans are nested or disjoint, so walking back from the last one closed,
+    # a span is top-level exactly when it ends before the last one kept starts.
+    outermost = []
+    for span in reversed(pending):
+        if not outermost or span[1] < outermost[-1][0]:
+            outermost.append(span)
+    for span_start, span_end in reversed(outermost):
+        yield text[span_start : span_end + 1]
+
+
+def _canonical_key(request: Dict[str, Any]) -> Tuple[Any, bytes]:
+    """Hashable identity of a tool or resource request, independent of key order."""
+    name = request.get("name") or request.get("Name")
+    detail = request["args"] if "args" in request else request.get("ID")
+    return name, dumps(detail, sort_keys=True)
+
+
+def _run_concurrently(func, items: List[Any]) -> List[Any]:
+    """Apply func to each item on a thread pool, returning results in item order."""
+    if len(items) <= 1:
+        return [func(item) for item in items]
+    with ThreadPoolExecutor(max_workers=min(_MAX_WORKERS, len(items))) as executor:
+        return list(executor.map(func, items))
+
+
+@dataclass(frozen=True, slots=True)
+class SessionHeader:
+    """Identity of the current session instance, as reported by status()."""
+
+    session_name: Optional[str] = None
+    session_start_dt: Optional[str] = None
 
 
 class PAI:
@@ -28,27 +157,58 @@ class PAI:
     Unified interface for all AI model providers
     """
 
+    __slots__ = (
+        "model_session",
+        "current_provider",
+        "current_model",
+        "_provider_kwargs",
+        "tool_enabled",
+        "resource_enabled",
+        "session_file",
+        "meta_file",
+        "context",
+        "cache",
+        "session_log",
+        "header",
+        "resource_cache_ttl",
+        "_log_cache",
+        "_log_cache_stat",
+        "_log_cache_sizes",
+        "_enc_api_key",
+        "_session_log_version",
+        "_ctx_cache",
+        "_resource_cache",
+    )
+
     def __init__(self, session_name):
         self.model_session = ModelSession()
         self.current_provider = None
         self.current_model = None
+        self._provider_kwargs = None
         self.tool_enabled = True
         self.resource_enabled = True
-        self.session_file = (
-            Path.home() / f".PAI/PAI_session_logs/PAI_session_log_{session_name}.json"
-        )
+        self.session_file = _SESSION_DIR / f"PAI_session_log_{session_name}.jsonl"
+        self.meta_file = self.session_file.with_suffix(".meta.json")
+        _ensure_session_dir()
         self.context = ContextManager()
+        # Set to None to send every call to the provider
+        self.cache: Optional[LLMCache] = LLMCache()
+        self._log_cache = None
+        self._log_cache_stat = None
+        self._log_cache_sizes = None
+        self._enc_api_key = None
+        # Bumped whenever the session instance (and so its tools/resources) changes
+        self._session_log_version = 0
+        self.header = SessionHeader()
+        self._ctx_cache: Tuple[Optional[str], int] = (None, -1)
+        # Resources fetched this session:
+        # (name, ID) -> (fetched_at, registry file stat, resource)
+        self._resource_cache: Dict[Tuple[str, Any], Tuple[float, Any, Any]] = {}
+        self.resource_cache_ttl = 300.0
 
     def init_session(self, session_name, provider, model, api_key=None):
         """Initialise session"""
-        try:
-            from .tools import tool_store
-            from .resources import resource_store
-
-            logger.debug("Stores ran")
-        except ImportError:
-            logger.warning("Failed to import stores")
-            pass
+        _ensure_stores()
 
         tool_list = ToolRegistry.get_tools()
         resource_metadata = ResourceRegistry.get_resource_metadata()
@@ -59,7 +219,7 @@ class PAI:
             "session_name": session_name,
             "session_instance": [
                 {
-                    "session_start_dt": datetime.utcnow().isoformat() + "Z",
+                    "session_start_dt": _utc_timestamp(),
                     "provider": provider,
                     "model": self.current_model,
                     "api_key": api_key,
@@ -70,22 +230,25 @@ class PAI:
             ],
         }
 
-        logger.debug(f"Session Log: {self.session_log}")
+        logger.debug("Session Log: %s", self.session_log)
+        self._session_instance_changed()
 
+        self._enc_api_key = self._encrypt_api_key(api_key)
+        self._write_session_meta()
         self.save_session()
 
     def load_session(
         self, session_name, provider: str = None, model: str = None, api_key=None
     ):
         """ """
+        _ensure_stores()
         self.get_session_log()
         prev = self.session_log["session_instance"][-1]
-        session_name_val = self.session_log["session_name"]
 
         tool_list = ToolRegistry.get_tools()
         resource_metadata = ResourceRegistry.get_resource_metadata()
         new_instance = {
-            "session_start_dt": datetime.utcnow().isoformat() + "Z",
+            "session_start_dt": _utc_timestamp(),
             "provider": provider if provider is not None else prev.get("provider"),
             "model": model if model is not None else prev.get("model"),
             "api_key": api_key if api_key is not None else prev.get("api_key"),
@@ -94,61 +257,209 @@ class PAI:
             "prompt_history": [],
         }
 
-        self.session_log = {
-            "session_name": session_name_val,
-            "session_instance": [new_instance],
-        }
+        # Keep the instances already in memory; save_session only writes the new tail
+        self.session_log["session_instance"].append(new_instance)
+        self._session_instance_changed()
+
+        if api_key is not None:
+            self._enc_api_key = self._encrypt_api_key(api_key)
 
         self.recreate_session()
         self.save_session()
 
     def save_session(self):
-        """Save current session to file if empty overwrite, if populated append."""
+        """Append the latest session instance to the session log as one JSON line."""
         if not self.session_log or "session_instance" not in self.session_log:
             raise ValueError("session_log is not initialized")
 
-        latest_inst = dict(self.session_log["session_instance"][-1])
-        if latest_inst.get("api_key") and latest_inst["api_key"] != "ENV_VAR":
-            latest_inst["api_key"] = encrypt_api_key(latest_inst["api_key"])
-
-        if not self.session_file.exists():
-            write_log = {
-                "session_name": self.session_log["session_name"],
-                "session_instance": [latest_inst],
-            }
-            self.session_file.parent.mkdir(parents=True, exist_ok=True)
-            with open(self.session_file, "w") as f:
-                json.dump(write_log, f, indent=2)
-            logger.info(f"Session data saved: {self.session_file}")
+        # The key is encrypted once when it enters the session, not on every save.
+        # Prompt history lives in the history file, so the line stays small.
+        latest_inst = {
+            key: value
+            for key, value in self.session_log["session_instance"][-1].items()
+            if key != "prompt_history"
+        }
+        latest_inst["api_key"] = self._enc_api_key
+
+        # Serialize now so later changes to session_log can't leak into this line;
+        # the disk write itself happens on the background writer thread.
+        line = dumps(latest_inst) + b"\n"
+
+        # What is being written is what get_session_log would parse back
+        self._log_cache = self.session_log
+        self._queue_log_write(self.session_file, line)
+        logger.info(f"Session instance queued for: {self.session_file}")
+
+    def flush(self):
+        """Block until queued session log writes are on disk."""
+        _SESSION_WRITER.flush()
+
+    def close(self):
+        """Flush pending writes and close this session's open log files."""
+        _SESSION_WRITER.close(self.session_file, self.history_file)
+
+    @property
+    def history_file(self) -> Path:
+        """Append-only prompt history, one JSON line per prompt/response."""
+        return self.session_file.with_suffix(".history.jsonl")
+
+    def _queue_log_write(self, path: Path, data: bytes):
+        """Queue an append to the session or history file on the background writer."""
+        # The cached log stays valid only if this instance's appends are the
+        # only change to the files, so track the sizes they should reach from
+        # the last stat known to match the cache. Another writer's append
+        # makes the files larger than expected for good.
+        sizes = self._log_cache_sizes
+        if sizes is None and self._log_cache_stat is not None:
+            sizes = self._log_cache_stat[1], self._log_cache_stat[2] or 0
+        if sizes is not None:
+            log_size, history_size = sizes
+            if path == self.session_file:
+                log_size += len(data)
+            else:
+                history_size += len(data)
+            sizes = log_size, history_size
+        self._log_cache_sizes = sizes
+        self._log_cache_stat = None
+        _SESSION_WRITER.append(path, data, on_written=self._record_session_file_stat)
+
+    def _record_session_file_stat(self):
+        """Adopt the on-disk stat once the files hold exactly this instance's writes."""
+        try:
+            stat_key = self._session_file_stat()
+        except FileNotFoundError:
             return
+        if self._log_cache_sizes == (stat_key[1], stat_key[2] or 0):
+            self._log_cache_stat = stat_key
 
-        with open(self.session_file, "r") as f:
-            existing_data = json.load(f)
-
-        existing_data.setdefault("session_instance", []).append(latest_inst)
+    @staticmethod
+    def _encrypt_api_key(api_key):
+        if api_key and api_key != "ENV_VAR":
+            return encrypt_api_key(api_key)
+        return api_key
 
-        self.session_file.parent.mkdir(parents=True, exist_ok=True)
-        with open(self.session_file, "w") as f:
-            json.dump(existing_data, f, indent=2)
-        logger.info(f"Session instance appended to: {self.session_file}")
-
-    def get_session_log(self):
-        """Load existing session from file and normalize self.session_log."""
-        with open(self.session_file, "r") as f:
-            entire_session = json.load(f)
+    def _session_file_stat(self) -> Tuple[int, int, Optional[int]]:
+        st = self.session_file.stat()
+        try:
+            history_size = self.history_file.stat().st_size
+        except FileNotFoundError:
+            history_size = None
+        return st.st_mtime_ns, st.st_size, history_size
+
+    def _write_session_meta(self, session_name: Optional[str] = None):
+        """Write the session header (name) alongside the session log."""
+        if session_name is None:
+            session_name = self.session_log["session_name"]
+        # Write a temporary file and rename it over the header, so a crash
+        # mid-write never leaves a truncated header behind.
+        tmp = self.meta_file.with_suffix(".json.tmp")
+        tmp.write_bytes(dumps({"session_name": session_name}))
+        os.replace(tmp, self.meta_file)
+
+    @property
+    def legacy_session_file(self) -> Path:
+        """Single JSON document sessions were saved to before the JSONL log."""
+        return self.session_file.with_suffix(".json")
+
+    def _import_legacy_session(self) -> bool:
+        """
+        One-time import of a legacy .json session into the JSONL layout.
 
-        session_instances = entire_session.get("session_instance", [])
-        if not session_instances:
+        The legacy file is left in place. Returns False if there is none.
+        """
+        try:
+            legacy = loads(self.legacy_session_file.read_bytes())
+        except FileNotFoundError:
+            return False
+        logger.info(f"Importing legacy session log: {self.legacy_session_file}")
+
+        # Every legacy save appended a full copy of the latest instance; keep
+        # the last copy of each instance, in the order they were started
+        instances: Dict[Any, Dict[str, Any]] = {}
+        for inst in legacy.get("session_instance", []):
+            instances[inst.get("session_start_dt")] = inst
+
+        self._write_session_meta(legacy["session_name"])
+        history = [
+            dumps({"session_start_dt": start_dt, **record}) + b"\n"
+            for start_dt, inst in instances.items()
+            for record in inst.get("prompt_history") or ()
+        ]
+        tmp = self.history_file.with_suffix(".jsonl.tmp")
+        tmp.write_bytes(b"".join(history))
+        os.replace(tmp, self.history_file)
+
+        lines = [
+            dumps({k: v for k, v in inst.items() if k != "prompt_history"}) + b"\n"
+            for inst in instances.values()
+        ]
+        # The session log is renamed into place last, so an interrupted
+        # import is simply retried on the next load
+        tmp = self.session_file.with_suffix(".jsonl.tmp")
+        tmp.write_bytes(b"".join(lines))
+        os.replace(tmp, self.session_file)
+        return True
+
+    def _read_last_instance(self) -> Optional[bytes]:
+        """Return the last non-empty line of the session log without reading the whole file."""
+        with open(self.session_file, "rb") as f:
+            end = f.seek(0, os.SEEK_END)
+            window = _TAIL_WINDOW
+            while True:
+                start = max(0, end - window)
+                f.seek(start)
+                lines = f.read(end - start).rstrip(b"\n").rsplit(b"\n", 1)
+                if len(lines) == 2 or start == 0:
+                    return lines[-1] or None
+                window *= 2
+
+    def _parse_session_log(self) -> Tuple[str, Dict[str, Any], Optional[str]]:
+        """Read the session name, latest instance and its stored (encrypted) API key."""
+        meta = loads(self.meta_file.read_bytes())
+
+        last_line = self._read_last_instance()
+        if not last_line:
             raise ValueError("No session instances found in session log.")
 
-        latest = dict(session_instances[-1])
-        if latest.get("api_key") and latest["api_key"] != "ENV_VAR":
-            latest["api_key"] = decrypt_api_key(latest["api_key"])
+        latest = loads(last_line)
+        # Turns are decoded on access rather than all at load
+        latest["prompt_history"] = PromptHistory.load(
+            self.history_file, latest.get("session_start_dt")
+        )
+        enc_api_key = latest.get("api_key")
+        if enc_api_key and enc_api_key != "ENV_VAR":
+            latest["api_key"] = decrypt_api_key(enc_api_key)
+        return meta["session_name"], latest, enc_api_key
 
+    def get_session_log(self):
+        """Load the latest session instance from file and normalize self.session_log."""
+        self.flush()
+        try:
+            stat_key = self._session_file_stat()
+        except FileNotFoundError:
+            if not self._import_legacy_session():
+                raise
+            stat_key = self._session_file_stat()
+        if self._log_cache is not None and stat_key == self._log_cache_stat:
+            self.session_log = self._log_cache
+            return self.session_log
+
+        shared = _SESSION_LOG_CACHE.get(self.session_file)
+        if shared is None or shared[0] != stat_key:
+            shared = (stat_key, *self._parse_session_log())
+            _SESSION_LOG_CACHE[self.session_file] = shared
+        _, session_name, parsed, self._enc_api_key = shared
+
+        # Each instance gets its own copy; add_prompt appends to the history
+        latest = {**parsed, "prompt_history": parsed["prompt_history"].copy()}
         self.session_log = {
-            "session_name": entire_session["session_name"],
+            "session_name": session_name,
             "session_instance": [latest],
         }
+        self._session_instance_changed()
+        self._log_cache = self.session_log
+        self._log_cache_stat = stat_key
+        self._log_cache_sizes = None
         return self.session_log
 
     def recreate_session(self):
@@ -162,16 +473,17 @@ class PAI:
 
     def add_prompt(self, prompt, response, tool_used, resource_used):
         latest = self.session_log["session_instance"][-1]
-        latest.setdefault("prompt_history", [])
-        latest["prompt_history"].append(
-            {
-                "prompt": prompt,
-                "response": response,
-                "resource_used": resource_used,
-                "tool_used": tool_used,
-            }
-        )
-        self.save_session()
+        record = {
+            "prompt": prompt,
+            "response": response,
+            "resource_used": resource_used,
+            "tool_used": tool_used,
+        }
+        latest.setdefault("prompt_history", []).append(record)
+
+        # Only the new record is written; the session instance line is unchanged
+        line = dumps({"session_start_dt": latest.get("session_start_dt"), **record})
+        self._queue_log_write(self.history_file, line + b"\n")
         logger.info("Prompt and response added to session log")
 
     def use_provider(self, provider: str, **kwargs) -> "PAI":
@@ -185,8 +497,17 @@ class PAI:
         Returns:
             Self for method chaining
         """
+        if (
+            self.model_session.provider is not None
+            and provider == self.current_provider
+            and kwargs == self._provider_kwargs
+        ):
+            logger.debug(f"Provider {provider} already initialized with these args")
+            return self
+
         self.model_session.init(provider, **kwargs)
         self.current_provider = provider
+        self._provider_kwargs = kwargs
         self.current_model = getattr(self.model_session.provider, 'model', None)
         logger.info(f"Using provider: {provider} with model: {self.current_model}")
         return self
@@ -227,47 +548,120 @@ class PAI:
             )
 
         if self.tool_enabled:
-            prompt = (
-                prompt + "\n" + self.context.create_prompt_context(self.session_log)
-            )
-            logger.debug(f"Prompt with context: {prompt}")
+            prompt = prompt + "\n" + self._prompt_context()
+            logger.debug("Prompt with context: %s", prompt)
+
+        return self._generate_cached(prompt, **kwargs)
 
-        return self.model_session.generate(prompt, **kwargs)
+    def _session_instance_changed(self):
+        """Refresh what is derived from the latest session instance."""
+        self._session_log_version += 1
+        latest = self.session_log["session_instance"][-1]
+        self.header = SessionHeader(
+            session_name=self.session_log.get("session_name"),
+            session_start_dt=latest.get("session_start_dt"),
+        )
+
+    def _prompt_context(self) -> str:
+        """Tool/resource banner for the current session instance, built once per version."""
+        context, version = self._ctx_cache
+        if version != self._session_log_version:
+            context = self.context.create_prompt_context(self.session_log)
+            self._ctx_cache = (context, self._session_log_version)
+        return context
+
+    def _generate_cached(self, prompt: str, **kwargs) -> str:
+        """Send prompt to the provider unless a deterministic response is cached"""
+        if self.cache is None or not self.cache.is_cacheable(kwargs):
+            return self.model_session.generate(prompt, **kwargs)
+
+        return self.cache.get_or_generate(
+            self.current_model,
+            prompt,
+            kwargs,
+            lambda: self.model_session.generate(prompt, **kwargs),
+            provider=self.current_provider,
+        )
 
     def call_tools(self, tool_list: Dict[str, Any]) -> Dict[str, Any]:
         results = []
+        calls = []
+        seen = set()
         for request in tool_list:
             if "name" not in request or "args" not in request:
                 results.append({"error": "Invalid tool request format"})
                 continue
+            key = _canonical_key(request)
+            if key in seen:
+                continue
+            seen.add(key)
+            # Placeholder filled in once the tool has run
+            results.append(None)
+            calls.append((len(results) - 1, request["name"], request["args"]))
 
-            tool_name = request["name"]
-            tool_args = request["args"]
-            result = ToolRegistry.execute_tool(tool_name, tool_args)
-            results.append(result)
-            logger.debug(f"Tool result: {results}")
+        executed = _run_concurrently(
+            lambda call: ToolRegistry.execute_tool(call[1], call[2]), calls
+        )
+        for (index, _, _), result in zip(calls, executed):
+            results[index] = result
+        logger.debug("Tool results: %s", results)
 
         return results
 
     def call_resources(self, resource_list: Dict[str, Any]) -> Dict[str, Any]:
         results = []
+        calls = []
         seen = set()
+        now = time.monotonic()
+        # Entries fetched before the registry file was last written are stale
+        registry_stat = ResourceRegistry.registry_stat()
         for request in resource_list:
             name = request.get("Name") or request.get("name")
             resource_id = request.get("ID")
-            key = (name, resource_id)
+            key = _canonical_key(request)
             if key in seen:
                 continue
             seen.add(key)
             if not name:
                 results.append({"error": "Invalid resource request format"})
                 continue
-            result = ResourceRegistry.get_resource(name, resource_id)
-            results.append(result)
-            logger.debug(f"Resource result: {results}")
+            cached = self._resource_cache.get((name, resource_id))
+            if (
+                cached is not None
+                and now - cached[0] < self.resource_cache_ttl
+                and cached[1] == registry_stat
+            ):
+                results.append(cached[2])
+                continue
+            results.append(None)
+            calls.append((len(results) - 1, name, resource_id))
+
+        fetched = _run_concurrently(
+            lambda call: ResourceRegistry.get_resource(call[1], call[2]), calls
+        )
+        for (index, name, resource_id), result in zip(calls, fetched):
+            results[index] = result
+            self._resource_cache[(name, resource_id)] = (now, registry_stat, result)
+        logger.debug("Resource results: %s", results)
 
         return results
 
+    def _call_tools_and_resources(
+        self, tool_calls: List[Dict[str, Any]], resource_calls: List[Dict[str, Any]]
+    ) -> Tuple[List[Any], List[Any]]:
+        """Run tool and resource requests side by side; neither depends on the other."""
+        if not tool_calls or not resource_calls:
+            tool_results = self.call_tools(tool_calls) if tool_calls else []
+            resource_results = (
+                self.call_resources(resource_calls) if resource_calls else []
+            )
+            return tool_results, resource_results
+
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            pending_resources = executor.submit(self.call_resources, resource_calls)
+            tool_results = self.call_tools(tool_calls)
+            return tool_results, pending_resources.result()
+
     def generate_loop(
         self,
         prompt: str,
@@ -308,16 +702,16 @@ class PAI:
                 )
                 return response, tools_used, resources_used
 
-            tool_results: List[Dict[str, Any]] = []
-            resource_results: List[Dict[str, Any]] = []
+            if not self.tool_enabled:
+                tool_calls = []
+            if not self.resource_enabled:
+                resource_calls = []
 
-            if self.tool_enabled and tool_calls:
-                tool_results = self.call_tools(tool_calls)
-                tools_used.extend(tool_calls)
-
-            if self.resource_enabled and resource_calls:
-                resource_results = self.call_resources(resource_calls)
-                resources_used.extend(resource_calls)
+            tool_results, resource_results = self._call_tools_and_resources(
+                tool_calls, resource_calls
+            )
+            tools_used.extend(tool_calls)
+            resources_used.extend(resource_calls)
 
             current_prompt = self.context.build_next_prompt(
                 original_prompt=original_prompt,
@@ -360,18 +754,19 @@ class PAI:
         if not self.tool_enabled and not self.resource_enabled:
             return response
 
-        tool_calls = self._extract_tool_calls(response)
-        request_calls = self._extract_resouce_call(response)
+        tool_calls = self._extract_tool_calls(response) if self.tool_enabled else []
+        request_calls = (
+            self._extract_resouce_call(response) if self.resource_enabled else []
+        )
 
-        if not tool_calls and request_calls:
+        if not tool_calls and not request_calls:
             return response
 
-        tool_results = self.call_tools(tool_calls)
-
-        tool_results_json = json.dumps(tool_results, indent=2)
-
-        resource_results = self.call_resources(request_calls)
-        resource_results_json = json.dumps(resource_results, indent=2)
+        tool_results, resource_results = self._call_tools_and_resources(
+            tool_calls, request_calls
+        )
+        # Compact: the prompt is read by the model, indentation only costs tokens
+        tool_results_json = dumps(tool_results).decode()
 
         resource_contents = []
         for res in resource_results:
@@ -395,7 +790,7 @@ class PAI:
         tools_parameters_used = [tool_call for tool_call in tool_calls]
         resource_parameters_used = [request_call for request_call in request_calls]
 
-        final_response = self.model_session.generate(new_prompt, **kwargs)
+        final_response = self._generate_cached(new_prompt, **kwargs)
         return final_response, tools_parameters_used, resource_parameters_used
 
     def _extract_tool_calls(self, text: str) -> List[Dict]:
@@ -408,62 +803,61 @@ class PAI:
         Returns:
             List of tool call dictionaries or empty list if none found
         """
+        # Most responses are plain answers; skip the scan when no request can be present
+        if '"name"' not in text or '"args"' not in text:
+            return []
+
         tool_calls = []
+        seen = set()
+        parsed = set()
 
-        tool_label = "Tool Request(s):"
-        chunks = text.split(tool_label)[1:]
-        for chunk in chunks:
-            match = re.search(r'\{[\s\S]*?"name"[\s\S]*?"args"[\s\S]*?\}', chunk)
-            if match:
-                json_str = match.group(0)
-                try:
-                    data = json.loads(json_str)
-                    if "name" in data and "args" in data:
-                        tool_calls.append(data)
-                except json.JSONDecodeError:
-                    continue
-
-        # Also match standalone JSON objects (for compatibility)
-        standalone_pattern = r'\{[\s\S]*?"name"[\s\S]*?"args"[\s\S]*?\}'
-        standalone_matches = re.findall(standalone_pattern, text)
-        for match in standalone_matches:
+        for candidate in _iter_json_objects(text):
+            # Responses often repeat a request verbatim; parse each span once
+            if candidate in parsed:
+                continue
+            # Spans without the request keys can't be tool requests
+            if '"name"' not in candidate or '"args"' not in candidate:
+                continue
+            parsed.add(candidate)
             try:
-                data = json.loads(match)
-                if "name" in data and "args" in data and data not in tool_calls:
-                    tool_calls.append(data)
-            except json.JSONDecodeError:
+                data = loads(candidate)
+            except JSONDecodeError:
                 continue
+            if "name" not in data or "args" not in data:
+                continue
+            key = _canonical_key(data)
+            if key not in seen:
+                seen.add(key)
+                tool_calls.append(data)
 
-        logger.debug(f"Tools extracted: {tool_calls}")
+        logger.debug("Tools extracted: %s", tool_calls)
         return tool_calls
 
     def _extract_resouce_call(self, text: str):
+        if '"Name"' not in text:
+            return []
+
         resource_calls = []
+        seen = set()
+        parsed = set()
 
-        resource_label = "Request Resource(s):"
-        chunks = text.split(resource_label)[1:]
-        for chunk in chunks:
-            match = re.search(r'\{[\s\S]*?"Name"[\s\S]*?\}', chunk)
-            if match:
-                json_str = match.group(0)
-                try:
-                    data = json.loads(json_str)
-                    if "Name" in data:
-                        resource_calls.append(data)
-                except json.JSONDecodeError:
-                    continue
-
-        standalone_pattern = r'\{[\s\S]*?"Name"[\s\S]*?\}'
-        standalone_matches = re.findall(standalone_pattern, text)
-        for match in standalone_matches:
+        for candidate in _iter_json_objects(text):
+            # Responses often repeat a request verbatim; parse each span once
+            if candidate in parsed or '"Name"' not in candidate:
+                continue
+            parsed.add(candidate)
             try:
-                data = json.loads(match)
-                if "Name" in data and data not in resource_calls:
-                    resource_calls.append(data)
-            except json.JSONDecodeError:
+                data = loads(candidate)
+            except JSONDecodeError:
+                continue
+            if "Name" not in data:
                 continue
+            key = _canonical_key(data)
+            if key not in seen:
+                seen.add(key)
+                resource_calls.append(data)
 
-        logger.debug(f"Resources extracted: {resource_calls}")
+        logger.debug("Resources extracted: %s", resource_calls)
         return resource_calls
 
     @classmethod
@@ -478,13 +872,7 @@ class PAI:
     def status(self) -> Dict[str, Any]:
         """Get current provider and model info"""
         logger.debug("Fetching session status")
-        return {
-            "session_name": (
-                self.session_log.get("session_name") if self.session_log else None
-            ),
-            "session_start_dt": (
-                self.session_log.get("session_start_dt") if self.session_log else None
-            ),
+        return asdict(self.header) | {
             "provider": self.current_provider,
             "model": self.current_model,
             "initialized": self.model_session.provider is not None,
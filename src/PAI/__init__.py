@@ -1,3 +1,26 @@
-from .PAI import PAI
+import sys
+import types
 
 __all__ = ["PAI"]
+
+
+class _Package(types.ModuleType):
+    def __setattr__(self, name, value):
+        # Importing the PAI.PAI submodule binds it on the package under the
+        # same name as the class; keep the class there instead.
+        if name == "PAI" and isinstance(value, types.ModuleType):
+            value = value.PAI
+        super().__setattr__(name, value)
+
+
+def __getattr__(name):
+    # PAI (and the provider/resource stacks behind it) is only imported when
+    # first used, so commands such as `pai --help` start quickly.
+    if name == "PAI":
+        from .PAI import PAI
+
+        return PAI
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+sys.modules[__name__].__class__ = _Package
@@ -0,0 +1,289 @@
+"""
+Response cache for deterministic LLM calls.
+
+Responses are keyed by a hash of the model, the normalized prompt and the
+generation parameters. Only calls with temperature 0 (or no temperature) are
+cached, since other calls are expected to vary between runs.
+"""
+
+import hashlib
+import math
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Protocol, Sequence, Tuple
+
+from PAI.utils.json_io import dumps
+from PAI.utils.logger import logger
+
+
+class CacheBackend(Protocol):
+    def get(self, key: str) -> Optional[str]: ...
+
+    def set(self, key: str, response: str, **metadata: Any) -> None: ...
+
+    def delete(self, key: str) -> None: ...
+
+
+class MemoryLRU:
+    """In-memory least-recently-used cache"""
+
+    def __init__(self, max_entries: int = 256):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, Tuple[str, Optional[float]]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[str]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            response, expires_at = entry
+            if expires_at is not None and expires_at <= time.time():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return response
+
+    def set(self, key: str, response: str, ttl: Optional[float] = None, **metadata):
+        expires_at = time.time() + ttl if ttl else None
+        with self._lock:
+            self._entries[key] = (response, expires_at)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def delete(self, key: str):
+        with self._lock:
+            self._entries.pop(key, None)
+
+
+class SQLiteBackend:
+    """On-disk cache that persists responses across sessions"""
+
+    _SCHEMA = """
+        CREATE TABLE IF NOT EXISTS llm_cache (
+            prompt_hash TEXT PRIMARY KEY,
+            model TEXT,
+            provider TEXT,
+            prompt_text TEXT,
+            response_text TEXT NOT NULL,
+            created_at REAL NOT NULL,
+            ttl REAL
+        )
+    """
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(self.path, check_same_thread=False)
+        self._lock = threading.Lock()
+        with self._lock, self._conn:
+            self._conn.execute(self._SCHEMA)
+
+    def get(self, key: str) -> Optional[str]:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT response_text, created_at, ttl FROM llm_cache WHERE prompt_hash = ?",
+                (key,),
+            ).fetchone()
+        if row is None:
+            return None
+        response, created_at, ttl = row
+        if ttl and created_at + ttl <= time.time():
+            self.delete(key)
+            return None
+        return response
+
+    def set(
+        self,
+        key: str,
+        response: str,
+        ttl: Optional[float] = None,
+        model: Optional[str] = None,
+        provider: Optional[str] = None,
+        prompt: Optional[str] = None,
+        **metadata,
+    ):
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO llm_cache VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (key, model, provider, prompt, response, time.time(), ttl),
+            )
+
+    def delete(self, key: str):
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM llm_cache WHERE prompt_hash = ?", (key,))
+
+    def close(self):
+        self._conn.close()
+
+
+def _normalize_prompt(prompt: str) -> str:
+    return " ".join(prompt.split())
+
+
+def _cosine(a: Sequence[float], b: Sequence[float]) -> float:
+    dot = sum(x * y for x, y in zip(a, b))
+    norm = math.sqrt(sum(x * x for x in a)) * math.sqrt(sum(y * y for y in b))
+    return dot / norm if norm else 0.0
+
+
+class LLMCache:
+    """
+    Cache of LLM responses for deterministic calls
+
+    Args:
+        backend: Where responses are stored, defaults to an in-memory LRU
+        ttl: Seconds a response stays valid, None to keep it until evicted
+        embed: Optional callable returning an embedding for a prompt. When set,
+            a miss falls back to the most similar cached prompt for the same
+            model and parameters.
+        similarity_threshold: Minimum cosine similarity for a semantic hit
+    """
+
+    def __init__(
+        self,
+        backend: Optional[CacheBackend] = None,
+        ttl: Optional[float] = None,
+        embed: Optional[Callable[[str], Sequence[float]]] = None,
+        similarity_threshold: float = 0.95,
+        max_semantic_entries: int = 256,
+    ):
+        self.backend = backend if backend is not None else MemoryLRU()
+        self.ttl = ttl
+        self.embed = embed
+        self.similarity_threshold = similarity_threshold
+        self.max_semantic_entries = max_semantic_entries
+        # Per model/parameter scope: (embedding, cache key) of cached prompts
+        self._embeddings: Dict[str, List[Tuple[Sequence[float], str]]] = {}
+        # Calls currently waiting on the provider, by cache key
+        self._inflight: Dict[str, Future] = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def is_cacheable(kwargs: Dict[str, Any]) -> bool:
+        """
+        Only deterministic calls are cached, and only when their parameters
+        can be serialized into the cache key (e.g. not an httpx.Timeout)
+        """
+        if kwargs.get("temperature"):
+            return False
+        try:
+            dumps(kwargs, sort_keys=True)
+        except TypeError:
+            return False
+        return True
+
+    @staticmethod
+    def _scope(model: Optional[str], kwargs: Dict[str, Any]) -> str:
+        return hashlib.sha256(
+            dumps({"model": model, "kwargs": kwargs}, sort_keys=True)
+        ).hexdigest()
+
+    @staticmethod
+    def cache_key(model: Optional[str], prompt: str, kwargs: Dict[str, Any]) -> str:
+        """sha256 of the model, normalized prompt and generation parameters"""
+        payload = {
+            "model": model,
+            "prompt": _normalize_prompt(prompt),
+            "kwargs": kwargs,
+        }
+        return hashlib.sha256(dumps(payload, sort_keys=True)).hexdigest()
+
+    def get(
+        self, model: Optional[str], prompt: str, kwargs: Dict[str, Any]
+    ) -> Optional[str]:
+        """Return the cached response for this call, or None on a miss"""
+        response = self.backend.get(self.cache_key(model, prompt, kwargs))
+        if response is not None or self.embed is None:
+            return response
+
+        scope = self._scope(model, kwargs)
+        with self._lock:
+            candidates = list(self._embeddings.get(scope, ()))
+        if not candidates:
+            return None
+
+        vector = self.embed(prompt)
+        best_score, best_key = max(
+            ((_cosine(vector, emb), key) for emb, key in candidates),
+            key=lambda item: item[0],
+        )
+        if best_score < self.similarity_threshold:
+            return None
+        logger.debug(f"Semantic cache hit with similarity {best_score:.3f}")
+        return self.backend.get(best_key)
+
+    def set(
+        self,
+        model: Optional[str],
+        prompt: str,
+        kwargs: Dict[str, Any],
+        response: str,
+        provider: Optional[str] = None,
+    ):
+        """Store the response for this call"""
+        key = self.cache_key(model, prompt, kwargs)
+        self.backend.set(
+            key,
+            response,
+            ttl=self.ttl,
+            model=model,
+            provider=provider,
+            prompt=prompt,
+        )
+        if self.embed is None:
+            return
+
+        vector = self.embed(prompt)
+        scope = self._scope(model, kwargs)
+        with self._lock:
+            entries = self._embeddings.setdefault(scope, [])
+            entries.append((vector, key))
+            del entries[: -self.max_semantic_entries]
+
+    def get_or_generate(
+        self,
+        model: Optional[str],
+        prompt: str,
+        kwargs: Dict[str, Any],
+        generate: Callable[[], str],
+        provider: Optional[str] = None,
+    ) -> str:
+        """
+        Return the cached response, or call generate() and cache its result
+
+        Concurrent callers with the same key share one generate() call: the
+        first caller sends the request and the rest wait for its result.
+        """
+        cached = self.get(model, prompt, kwargs)
+        if cached is not None:
+            logger.info("Response served from cache")
+            return cached
+
+        key = self.cache_key(model, prompt, kwargs)
+        with self._lock:
+            future = self._inflight.get(key)
+            owner = future is None
+            if owner:
+                future = Future()
+                self._inflight[key] = future
+        if not owner:
+            logger.info("Waiting on an identical request already in flight")
+            return future.result()
+
+        try:
+            response = generate()
+            self.set(model, prompt, kwargs, response, provider=provider)
+            future.set_result(response)
+            return response
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        finally:
+            with self._lock:
+                del self._inflight[key]
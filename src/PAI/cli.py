@@ -1,6 +1,6 @@
-﻿import typer
-from typing import Optional, List
-from .PAI import PAI
+﻿import re
+import typer
+from typing import Optional, List, Dict, Any
 import logging
 
 from PAI.utils.logger import logger
@@ -11,6 +11,36 @@ def _access_console_hadler(verbose):
     # print(f"Logging level set to {'DEBUG' if verbose else 'WARNING'}")
 
 
+_PARAM_RE = re.compile(r"([^=]+)=(.*)", re.DOTALL)
+_NUMBER_RE = re.compile(r"(?P<int>-?\d+)|(?P<float>-?(?:\d+\.\d*|\.\d+))")
+_BOOLS = {"true": True, "false": False}
+
+
+def _parse_params(params: List[str]) -> Dict[str, Any]:
+    """Parse name=value options, converting booleans, ints and floats"""
+    kwargs = {}
+    for param in params:
+        match = _PARAM_RE.fullmatch(param)
+        if match is None:
+            typer.echo(
+                f"Invalid parameter format: {param}. Use name=value format.",
+                err=True,
+            )
+            continue
+        name, value = match.groups()
+        if value.lower() in _BOOLS:
+            kwargs[name] = _BOOLS[value.lower()]
+            continue
+        number = _NUMBER_RE.fullmatch(value)
+        if number is None:
+            kwargs[name] = value
+        elif number.lastgroup == "int":
+            kwargs[name] = int(value)
+        else:
+            kwargs[name] = float(value)
+    return kwargs
+
+
 app = typer.Typer(help="Personal AI Interface - Initialize once, prompt many times")
 
 
@@ -24,6 +54,8 @@ def init(
         False, "--verbose", "-v", help="Enable verbose logging"
     ),
 ):
+    from .PAI import PAI
+
     _access_console_hadler(verbose)
 
     try:
@@ -53,6 +85,8 @@ def load(
         False, "--verbose", "-v", help="Enable verbose logging"
     ),
 ):
+    from .PAI import PAI
+
     _access_console_hadler(verbose)
 
     try:
@@ -92,6 +126,8 @@ def prompt(
         False, "--verbose", "-v", help="Enable verbose logging"
     ),
 ):
+    from .PAI import PAI
+
     _access_console_hadler(verbose)
 
     try:
@@ -100,29 +136,7 @@ def prompt(
         ai.recreate_session()
         if show_session_log:
             typer.echo(f"Using: {ai.current_provider} ({ai.current_model})")
-        kwargs = {}
-        for param in params:
-            try:
-                name, value = param.split("=", 1)
-                if value.lower() == "true":
-                    kwargs[name] = True
-                elif value.lower() == "false":
-                    kwargs[name] = False
-                else:
-                    if value.isdigit():
-                        kwargs[name] = int(value)
-                    elif (
-                        all(c.isdigit() or c == "." for c in value)
-                        and value.count(".") <= 1
-                    ):
-                        kwargs[name] = float(value)
-                    else:
-                        kwargs[name] = value
-            except ValueError:
-                typer.echo(
-                    f"Invalid parameter format: {param}. Use name=value format.",
-                    err=True,
-                )
+        kwargs = _parse_params(params)
 
         final_response, tool_use, resource_use = ai.generate_loop(
             text, iterations=iterations, **kwargs
@@ -142,6 +156,8 @@ def status(
 ):
     """Show current session status"""
 
+    from .PAI import PAI
+
     _access_console_hadler(verbose)
 
     try:
@@ -149,16 +165,18 @@ def status(
         ai.get_session_log()
         ai.recreate_session()
         session_status = ai.status()
-        typer.echo("Current Session:")
-        typer.echo(f"   Provider: {session_status['provider']}")
-        typer.echo(f"   Model: {session_status['model']}")
+        lines = [
+            "Current Session:",
+            f"   Provider: {session_status['provider']}",
+            f"   Model: {session_status['model']}",
+            f"   API Key: {'Set' if ai.session_log.get('api_key') else 'From environment'}",
+            f"   Config file: {ai.session_file}",
+        ]
+        typer.echo("\n".join(lines))
+    except Exception:
         typer.echo(
-            f"   API Key: {'Set' if ai.session_log.get('api_key') else 'From environment'}"
+            "No active session\nRun 'PAI init <provider>' to create a session"
         )
-        typer.echo(f"   Config file: {ai.session_file}")
-    except Exception:
-        typer.echo("No active session")
-        typer.echo("Run 'PAI init <provider>' to create a session")
 
 
 @app.command()
@@ -170,6 +188,8 @@ def test(
 ):
     """Test the current session with a simple prompt"""
 
+    from .PAI import PAI
+
     _access_console_hadler(verbose)
 
     try:
@@ -194,13 +214,18 @@ def providers(
 ):
     """List available providers and their default models"""
 
+    from .models.model_registry import ProviderRegistry
+
     _access_console_hadler(verbose)
 
-    providers = PAI.available_providers()
-    typer.echo("Available Providers:")
-    for provider in providers:
-        typer.echo(f"   - {provider}")
-    typer.echo("\nUse 'PAI init <session name> <provider> --model <model>' to initialize a session")
+    lines = ["Available Providers:"]
+    lines.extend(
+        f"   - {provider}" for provider in ProviderRegistry.get_registered_providers()
+    )
+    lines.append(
+        "\nUse 'PAI init <session name> <provider> --model <model>' to initialize a session"
+    )
+    typer.echo("\n".join(lines))
 
 
 if __name__ == "__main__":
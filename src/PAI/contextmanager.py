@@ -1,16 +1,58 @@
-import json
-from typing import Dict, Any, Optional, List
+from typing import Dict, Any, Optional, List, Tuple
 from .tools.tool_registry import ToolRegistry
 from .resources.resource_registry import ResourceRegistry
 
+from PAI.utils.json_io import dumps
 from PAI.utils.logger import logger
 
+# Fixed parts of the prompts; only the JSON and results between them vary
+_BANNER_HEAD = """Capabilities banner (tools/resources available this session):
+- If the user's request doesn't need tools/resources, answer directly and concisely.
+- Only request tools/resources when strictly needed.
+- Once you have enough information, provide a final answer without further requests.
+
+TOOLS:
+"""
+_BANNER_MID = "\n\nRESOURCES:\n"
+
+_NEXT_PROMPT_HEAD = """You are given tool execution results and resource contents. Use these to proceed.
+
+Tool results:
+"""
+_NEXT_PROMPT_MID = "\n\nResource contents:\n"
+_NEXT_PROMPT_TAIL = """
+
+If you still need more tools or resources, provide ONLY the JSON request(s) per protocol and no prose.
+Otherwise, provide the best final answer based strictly on the above.
+Original question: """
+
 
 class ContextManager:
     def __init__(self) -> None:
         self.tools_available: Optional[List[Dict[str, Any]]] = None
         self.resources_available: Optional[List[Dict[str, Any]]] = None
         self.meta_prompt: Optional[str] = None
+        # Serialized registry listings by slot: (listing, json text)
+        self._json_cache: Dict[str, Tuple[list, str]] = {}
+
+    def _cached_json(
+        self, slot: str, obj: List[Dict[str, Any]], current: List[Dict[str, Any]]
+    ) -> str:
+        """
+        Pretty JSON for obj, reused while obj is the registry's current listing.
+
+        The registries build a new listing whenever they change (a tool is
+        registered, the resource file's stat changes), so the listing itself
+        marks the registry state. Any other list is serialized every time.
+        """
+        if obj is not current:
+            return dumps(obj, indent=True).decode("utf-8")
+        cached = self._json_cache.get(slot)
+        if cached is not None and cached[0] is current:
+            return cached[1]
+        text = dumps(obj, indent=True).decode("utf-8")
+        self._json_cache[slot] = (current, text)
+        return text
 
     def get_tool_list(self) -> Optional[List[Dict[str, Any]]]:
         """
@@ -22,7 +64,7 @@ class ContextManager:
             return None
         tool_list = ToolRegistry.get_tools()
         self.tools_available = tool_list
-        logger.info(f"Tool list retrieved: {tool_list}")
+        logger.info("Tool list retrieved: %s", tool_list)
         return tool_list
 
     def get_resource_metadata(self) -> Optional[List[Dict[str, Any]]]:
@@ -32,7 +74,7 @@ class ContextManager:
         logger.debug("Attempting to get resource metadata.")
         resource_metadata = ResourceRegistry.get_resource_metadata()
         self.resources_available = resource_metadata
-        logger.info(f"Resource metadata retrieved: {resource_metadata}")
+        logger.info("Resource metadata retrieved: %s", resource_metadata)
         return resource_metadata
 
     def create_prompt_context(self, session_log: dict) -> str:
@@ -59,18 +101,18 @@ class ContextManager:
             self.meta_prompt = ""
             return ""
 
-        meta_prompt_text = f"""
-Capabilities banner (tools/resources available this session):
-- If the user's request doesn't need tools/resources, answer directly and concisely.
-- Only request tools/resources when strictly needed.
-- Once you have enough information, provide a final answer without further requests.
-
-TOOLS:
-{json.dumps(tool_list, indent=2)}
-
-RESOURCES:
-{json.dumps(resource_metadata, indent=2)}
-""".strip()
+        meta_prompt_text = "".join(
+            (
+                _BANNER_HEAD,
+                self._cached_json("tools", tool_list, ToolRegistry.get_tools()),
+                _BANNER_MID,
+                self._cached_json(
+                    "resources",
+                    resource_metadata,
+                    ResourceRegistry.get_resource_metadata(),
+                ),
+            )
+        )
 
         self.meta_prompt = meta_prompt_text
         logger.info("Meta prompt context created.")
@@ -90,33 +132,23 @@ RESOURCES:
         """
         logger.debug("Building next prompt from tool/resource results.")
 
-        tool_results_json = json.dumps(tool_results, indent=2)
-
-        resource_contents: List[str] = []
-        for res in resource_results:
-            content = res.get("Content")
-            if content:
-                resource_contents.append(content)
+        tool_results_json = dumps(tool_results, indent=True).decode("utf-8")
 
         resource_contents_text = (
-            "\n".join(resource_contents)
-            if resource_contents
-            else "No resource content found."
+            "\n".join(res["Content"] for res in resource_results if res.get("Content"))
+            or "No resource content found."
         )
 
-        next_prompt = f"""
-You are given tool execution results and resource contents. Use these to proceed.
-
-Tool results:
-{tool_results_json}
-
-Resource contents:
-{resource_contents_text}
-
-If you still need more tools or resources, provide ONLY the JSON request(s) per protocol and no prose.
-Otherwise, provide the best final answer based strictly on the above.
-Original question: {original_prompt}
-""".strip()
+        next_prompt = "".join(
+            (
+                _NEXT_PROMPT_HEAD,
+                tool_results_json,
+                _NEXT_PROMPT_MID,
+                resource_contents_text,
+                _NEXT_PROMPT_TAIL,
+                original_prompt,
+            )
+        ).strip()
 
         logger.info("Next prompt constructed for iterative step.")
         return next_prompt
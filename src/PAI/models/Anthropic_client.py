@@ -1,10 +1,32 @@
+import asyncio
 import os
+import time
+from typing import List, Optional
 import anthropic
 from .model_registry import ProviderRegistry
 from . import systemprompt
 
 from PAI.utils.logger import logger
 
+# Parameters set by the client that kwargs may not override
+_RESERVED_PARAMS = frozenset(("model", "max_tokens", "system", "messages"))
+
+
+def _cached_system(text: str):
+    """
+    System prompt as a text block with a prompt caching breakpoint
+
+    Anthropic only caches prefixes of at least 1024 tokens (2048 on Haiku
+    models); shorter prompts are processed normally and the breakpoint has no
+    effect. The bundled system prompt is well under that, so caching only
+    applies to longer caller-supplied system prompts.
+    """
+    return [{"type": "text", "text": text, "cache_control": {"type": "ephemeral"}}]
+
+
+# Built once rather than on every call
+_DEFAULT_SYSTEM = _cached_system(systemprompt.system_prompt)
+
 
 @ProviderRegistry.register("anthropic")
 class AnthropicClient:
@@ -14,14 +36,21 @@ class AnthropicClient:
         self.api_key = api_key or os.getenv("ANTHROPIC_API_KEY")
         self.model = model or "claude-3-haiku-20240307"
         self.client = anthropic.Anthropic(api_key=self.api_key)
+        # Async client and the event loop it was created on, see agenerate
+        self._async_client = None
+        self._async_loop = None
 
-    def generate(self, prompt: str, **kwargs):
+    def _params(self, prompt: str, kwargs) -> dict:
         if not prompt.strip():
             logger.error("Prompt cannot be empty")
             raise ValueError("Prompt cannot be empty")
 
         max_tokens = kwargs.get("max_tokens", 300)
-        system_prompt = kwargs.get("system", systemprompt.system_prompt)
+        system_prompt = kwargs.get("system")
+        if system_prompt is None:
+            system_prompt = _DEFAULT_SYSTEM
+        elif isinstance(system_prompt, str):
+            system_prompt = _cached_system(system_prompt)
 
         params = {
             "model": self.model,
@@ -31,11 +60,58 @@ class AnthropicClient:
         }
 
         # Prevent overriding reserved parameters
-        reserved = {"model", "max_tokens", "system", "messages"}
         for k, v in kwargs.items():
-            if k not in reserved:
+            if k not in _RESERVED_PARAMS:
                 params[k] = v
                 logger.debug(f"Setting custom parameter: {k}={v}")
+        return params
+
+    def generate(self, prompt: str, **kwargs):
+        resp = self.client.messages.create(**self._params(prompt, kwargs))
+        return resp.content[0].text
 
-        resp = self.client.messages.create(**params)
+    async def agenerate(self, prompt: str, **kwargs):
+        """Async generate; the async client is reused within one event loop"""
+        params = self._params(prompt, kwargs)
+        loop = asyncio.get_running_loop()
+        if self._async_loop is not loop:
+            self._async_client = anthropic.AsyncAnthropic(api_key=self.api_key)
+            self._async_loop = loop
+        resp = await self._async_client.messages.create(**params)
         return resp.content[0].text
+
+    def batch_generate(
+        self, prompts: List[str], poll_interval: float = 30.0, **kwargs
+    ) -> List[Optional[str]]:
+        """
+        Generate responses through the Anthropic Message Batches API
+
+        Batches cost half as much as synchronous calls and have their own rate
+        limits, but may take up to 24 hours; this blocks, polling every
+        poll_interval seconds, until processing ends. Responses are in prompt
+        order, with None for any request that did not succeed.
+        """
+        if not prompts:
+            return []
+
+        batch = self.client.messages.batches.create(
+            requests=[
+                {"custom_id": str(i), "params": self._params(prompt, kwargs)}
+                for i, prompt in enumerate(prompts)
+            ]
+        )
+        logger.info(f"Submitted Anthropic batch {batch.id} with {len(prompts)} prompts")
+
+        while batch.processing_status != "ended":
+            time.sleep(poll_interval)
+            batch = self.client.messages.batches.retrieve(batch.id)
+
+        responses: List[Optional[str]] = [None] * len(prompts)
+        for entry in self.client.messages.batches.results(batch.id):
+            if entry.result.type == "succeeded":
+                responses[int(entry.custom_id)] = entry.result.message.content[0].text
+
+        failed = responses.count(None)
+        if failed:
+            logger.warning(f"{failed} of {len(prompts)} batch requests failed")
+        return responses
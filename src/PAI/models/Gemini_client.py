@@ -28,3 +28,16 @@ class GeminiClient:
 
 
         return resp.text
+
+    async def agenerate(self, prompt: str, **kwargs):
+        """Async generate through the client's aio interface"""
+        if not prompt.strip():
+            logger.error("Prompt cannot be empty")
+            raise ValueError("Prompt cannot be empty")
+
+        resp = await self.client.aio.models.generate_content(
+            model=self.model,
+            contents=prompt,
+            **{k: v for k, v in kwargs.items() if k not in {"model"}}
+        )
+        return resp.text
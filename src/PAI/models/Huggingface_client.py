@@ -1,5 +1,6 @@
+import asyncio
 import os
-from huggingface_hub import InferenceClient
+from huggingface_hub import AsyncInferenceClient, InferenceClient
 import anthropic
 from .model_registry import ProviderRegistry
 from . import systemprompt
@@ -18,8 +19,12 @@ class HuggingfaceClient:
         self.api_key = api_key or os.getenv("HUGGINGFACE_INFERENCE_TOKEN")
         self.model = model or "meta-llama/Llama-3.1-8B-Instruct"
         self.client = InferenceClient(api_key=self.api_key)
+        # Async client and the event loop it was created on, see agenerate
+        self._async_client = None
+        self._async_loop = None
 
-    def generate(self, prompt: str, **kwargs):
+    def _request(self, prompt: str, kwargs):
+        """Validated chat messages and generation kwargs for prompt"""
         if not prompt.strip():
             logger.error("Prompt cannot be empty")
             raise ValueError("Prompt cannot be empty")
@@ -38,9 +43,24 @@ class HuggingfaceClient:
         ]
 
         gen_kwargs = {k: v for k, v in kwargs.items() if k not in {"model", "system"}}
+        return messages, gen_kwargs
 
+    def generate(self, prompt: str, **kwargs):
+        messages, gen_kwargs = self._request(prompt, kwargs)
         resp = self.client.chat_completion(
             messages=messages, model=self.model, **gen_kwargs
         )
 
         return resp.choices[0].message.content
+
+    async def agenerate(self, prompt: str, **kwargs):
+        """Async generate; the async client is reused within one event loop"""
+        messages, gen_kwargs = self._request(prompt, kwargs)
+        loop = asyncio.get_running_loop()
+        if self._async_loop is not loop:
+            self._async_client = AsyncInferenceClient(api_key=self.api_key)
+            self._async_loop = loop
+        resp = await self._async_client.chat_completion(
+            messages=messages, model=self.model, **gen_kwargs
+        )
+        return resp.choices[0].message.content
@@ -1,10 +1,27 @@
+import asyncio
 import os
-from openai import OpenAI
+import time
+from typing import List, Optional
+from openai import AsyncOpenAI, OpenAI
 from .model_registry import ProviderRegistry
 from . import systemprompt
 
+from PAI.utils.json_io import dumps, loads
 from PAI.utils.logger import logger
 
+# Parameters set by the client that kwargs may not override
+_RESERVED_PARAMS = frozenset(("model", "messages"))
+
+# Sent first and unchanged on every call so OpenAI's automatic prompt caching
+# can reuse the prefix
+_SYSTEM_MESSAGE = {"role": "system", "content": systemprompt.system_prompt}
+
+# Parameters set by completions_batch itself
+_RESERVED_COMPLETION_PARAMS = frozenset(("model", "prompt", "n"))
+
+# Batch statuses after which no more results will arrive
+_BATCH_FINISHED = frozenset(("completed", "failed", "expired", "cancelled"))
+
 
 @ProviderRegistry.register("openai")
 class OpenAIClient:
@@ -12,8 +29,11 @@ class OpenAIClient:
         self.api_key = api_key or os.getenv("OPENAI_API_KEY")
         self.model = model or "gpt-3.5-turbo"
         self.client = OpenAI(api_key=self.api_key)
+        # Async client and the event loop it was created on, see agenerate
+        self._async_client = None
+        self._async_loop = None
 
-    def generate(self, prompt: str, **kwargs):
+    def _params(self, prompt: str, kwargs) -> dict:
         if not prompt.strip():
             logger.error("Prompt cannot be empty")
             raise ValueError("Prompt cannot be empty")
@@ -24,17 +44,122 @@ class OpenAIClient:
         params = {
             "model": self.model,
             "messages": [
-                {"role": "system", "content": systemprompt.system_prompt},
+                _SYSTEM_MESSAGE,
                 {"role": "user", "content": prompt},
             ],
         }
 
         # Prevent overriding reserved parameters
-        reserved = {"model", "messages"}
         for k, v in kwargs.items():
-            if k not in reserved:
+            if k not in _RESERVED_PARAMS:
                 params[k] = v
                 logger.debug(f"Setting custom parameter: {k}={v}")
+        return params
 
-        resp = self.client.chat.completions.create(**params)
+    def generate(self, prompt: str, **kwargs):
+        resp = self.client.chat.completions.create(**self._params(prompt, kwargs))
+        return resp.choices[0].message.content.strip()
+
+    async def agenerate(self, prompt: str, **kwargs):
+        """Async generate; the async client is reused within one event loop"""
+        params = self._params(prompt, kwargs)
+        loop = asyncio.get_running_loop()
+        if self._async_loop is not loop:
+            self._async_client = AsyncOpenAI(api_key=self.api_key)
+            self._async_loop = loop
+        resp = await self._async_client.chat.completions.create(**params)
         return resp.choices[0].message.content.strip()
+
+    def generate_samples(self, prompt: str, n: int, **kwargs) -> List[str]:
+        """
+        Generate n responses to one prompt in a single request
+
+        The prompt's input tokens are sent and billed once instead of n times,
+        and the call counts as one request against the rate limit.
+        """
+        params = self._params(prompt, kwargs)
+        params["n"] = n
+        resp = self.client.chat.completions.create(**params)
+        return [choice.message.content.strip() for choice in resp.choices]
+
+    def completions_batch(self, prompts: List[str], **kwargs) -> List[str]:
+        """
+        Generate responses for several prompts in one Completions request
+
+        Only completion models (e.g. gpt-3.5-turbo-instruct) serve the legacy
+        Completions endpoint, which takes a list of prompts; chat models
+        should use ModelSession.generate_batch instead. The system prompt is
+        not sent, since the endpoint has no system role. Responses are in
+        prompt order.
+        """
+        if not prompts:
+            return []
+
+        params = {"max_tokens": 300}
+        for k, v in kwargs.items():
+            if k not in _RESERVED_COMPLETION_PARAMS:
+                params[k] = v
+        resp = self.client.completions.create(
+            model=self.model, prompt=prompts, **params
+        )
+
+        responses = [""] * len(prompts)
+        for choice in resp.choices:
+            responses[choice.index] = choice.text.strip()
+        return responses
+
+    def batch_generate(
+        self, prompts: List[str], poll_interval: float = 30.0, **kwargs
+    ) -> List[Optional[str]]:
+        """
+        Generate responses through the OpenAI Batch API
+
+        Batches cost half as much as synchronous calls and have their own rate
+        limits, but may take up to 24 hours; this blocks, polling every
+        poll_interval seconds, until the batch finishes. Responses are in
+        prompt order, with None for any request that failed.
+        """
+        if not prompts:
+            return []
+
+        lines = [
+            dumps(
+                {
+                    "custom_id": str(i),
+                    "method": "POST",
+                    "url": "/v1/chat/completions",
+                    "body": self._params(prompt, kwargs),
+                }
+            )
+            for i, prompt in enumerate(prompts)
+        ]
+        batch_file = self.client.files.create(
+            file=("batch.jsonl", b"\n".join(lines)), purpose="batch"
+        )
+        batch = self.client.batches.create(
+            input_file_id=batch_file.id,
+            endpoint="/v1/chat/completions",
+            completion_window="24h",
+        )
+        logger.info(f"Submitted OpenAI batch {batch.id} with {len(prompts)} prompts")
+
+        while batch.status not in _BATCH_FINISHED:
+            time.sleep(poll_interval)
+            batch = self.client.batches.retrieve(batch.id)
+        if batch.status != "completed":
+            raise RuntimeError(f"OpenAI batch {batch.id} {batch.status}")
+
+        responses: List[Optional[str]] = [None] * len(prompts)
+        if batch.output_file_id:
+            output = self.client.files.content(batch.output_file_id).content
+            for line in output.splitlines():
+                record = loads(line)
+                response = record.get("response") or {}
+                if response.get("status_code") == 200:
+                    message = response["body"]["choices"][0]["message"]
+                    responses[int(record["custom_id"])] = message["content"].strip()
+
+        failed = responses.count(None)
+        if failed:
+            logger.warning(f"{failed} of {len(prompts)} batch requests failed")
+        return responses
@@ -0,0 +1,129 @@
+"""
+Concurrent generation for batch workloads such as evaluation runs.
+
+Prompts are sent through the provider's async agenerate when it has one (or
+its sync generate on worker threads otherwise), with a cap on requests in
+flight, optional requests-per-minute pacing and exponential backoff when the
+provider is rate limited or temporarily unavailable.
+"""
+
+import asyncio
+import random
+import sys
+import time
+from typing import Any, List, Optional
+
+from PAI.utils.logger import logger
+
+# HTTP statuses worth retrying: timeouts, rate limits and overloaded servers
+_RETRYABLE_STATUS = frozenset((408, 409, 429, 500, 502, 503, 504, 529))
+
+
+# Connection/timeout errors of the provider SDKs and HTTP libraries, which
+# don't subclass the built-in ConnectionError and carry no status code
+_CONNECTION_ERRORS = (
+    ("openai", "APIConnectionError"),
+    ("anthropic", "APIConnectionError"),
+    ("httpx", "TransportError"),
+    ("requests", "ConnectionError"),
+    ("requests", "Timeout"),
+    ("aiohttp", "ClientConnectionError"),
+)
+
+
+def _connection_error_types() -> tuple:
+    # Only check libraries that are already imported; a provider's SDK is
+    # loaded before any of its errors can be raised
+    types = [ConnectionError, TimeoutError]
+    for module_name, name in _CONNECTION_ERRORS:
+        module = sys.modules.get(module_name)
+        error_type = getattr(module, name, None)
+        if isinstance(error_type, type):
+            types.append(error_type)
+    return tuple(types)
+
+
+def _is_retryable(error: Exception) -> bool:
+    if isinstance(error, _connection_error_types()):
+        return True
+    status = getattr(error, "status_code", None)
+    if status is None:
+        status = getattr(getattr(error, "response", None), "status_code", None)
+    if status is None and isinstance(getattr(error, "code", None), int):
+        # google-genai APIError carries the HTTP status as code
+        status = error.code
+    return status in _RETRYABLE_STATUS
+
+
+class _RateLimiter:
+    """Spaces request starts evenly to stay under a requests-per-minute limit"""
+
+    def __init__(self, rpm: float):
+        self.interval = 60.0 / rpm
+        self._next_start = 0.0
+        self._lock = asyncio.Lock()
+
+    async def wait(self):
+        async with self._lock:
+            now = time.monotonic()
+            start = max(now, self._next_start)
+            self._next_start = start + self.interval
+        if start > now:
+            await asyncio.sleep(start - now)
+
+
+async def run_batch(
+    provider: Any,
+    prompts: List[str],
+    max_concurrency: int = 10,
+    rpm: Optional[float] = None,
+    max_retries: int = 3,
+    backoff: float = 1.0,
+    **kwargs,
+) -> List[str]:
+    """
+    Generate a response for each prompt concurrently
+
+    Args:
+        provider: Provider client with agenerate and/or generate
+        prompts: Independent prompts to send
+        max_concurrency: Most requests in flight at once
+        rpm: Optional requests-per-minute limit
+        max_retries: Retries per prompt for rate limits and transient errors
+        backoff: Initial retry delay in seconds, doubled on each retry
+        **kwargs: Generation parameters passed with every prompt
+
+    Returns:
+        Responses in prompt order
+    """
+    if not prompts:
+        return []
+
+    agenerate = getattr(provider, "agenerate", None)
+    if not callable(agenerate):
+
+        async def agenerate(prompt, **kw):
+            return await asyncio.to_thread(provider.generate, prompt, **kw)
+
+    semaphore = asyncio.Semaphore(max_concurrency)
+    limiter = _RateLimiter(rpm) if rpm else None
+
+    async def generate_one(prompt: str) -> str:
+        async with semaphore:
+            for attempt in range(max_retries + 1):
+                if limiter is not None:
+                    await limiter.wait()
+                try:
+                    return await agenerate(prompt, **kwargs)
+                except Exception as e:
+                    if attempt == max_retries or not _is_retryable(e):
+                        raise
+                    delay = backoff * 2**attempt
+                    delay += random.uniform(0, delay / 2)
+                    logger.warning(
+                        f"Request failed with {type(e).__name__}, retrying in {delay:.1f}s"
+                    )
+                    await asyncio.sleep(delay)
+
+    logger.debug(f"Sending {len(prompts)} prompts, at most {max_concurrency} at once")
+    return list(await asyncio.gather(*(generate_one(p) for p in prompts)))
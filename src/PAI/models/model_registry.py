@@ -1,8 +1,22 @@
+import importlib
+
 from PAI.utils.logger import logger
 
 
 class ProviderRegistry:
-    _registry = {}
+    # Built-in providers are registered by "module:Class" import string and only
+    # imported when first requested, so unused provider SDKs are never loaded.
+    _registry = {
+        "openai": "PAI.models.OpenAI_client:OpenAIClient",
+        "anthropic": "PAI.models.Anthropic_client:AnthropicClient",
+        "huggingface": "PAI.models.Huggingface_client:HuggingfaceClient",
+        "gemini": "PAI.models.Gemini_client:GeminiClient",
+    }
+    # get_registered_providers() result and the registry dict it was built
+    # from, rebuilt after a registration or once _registry is replaced or
+    # gains or loses entries
+    _names_snapshot = None
+    _names_source = None
 
     @classmethod
     def register(cls, name: str):
@@ -10,19 +24,45 @@ class ProviderRegistry:
 
         def inner_wrapper(wrapped_class):
             cls._registry[name] = wrapped_class
+            cls._names_snapshot = None
             logger.info(f"Registered provider: {name}")
             return wrapped_class
 
         return inner_wrapper
 
+    @classmethod
+    def register_lazy(cls, name: str, target: str):
+        """Register a provider by "module:Class" import string, imported on first use"""
+        cls._registry[name] = target
+        cls._names_snapshot = None
+        logger.info(f"Registered lazy provider: {name} -> {target}")
+
+    @classmethod
+    def _resolve(cls, name: str):
+        """Return the provider class, importing it if it was registered lazily"""
+        provider = cls._registry[name]
+        if isinstance(provider, str):
+            module_name, _, class_name = provider.partition(":")
+            logger.debug(f"Importing provider {name} from {module_name}")
+            provider = getattr(importlib.import_module(module_name), class_name)
+            cls._registry[name] = provider
+        return provider
+
     @classmethod
     def get_provider(cls, name: str, **kwargs):
         if name not in cls._registry:
             raise ValueError(f"Unknown provider: {name}")
         logger.info(f"Instantiating provider: {name} with args: {kwargs}")
-        return cls._registry[name](**kwargs)
+        return cls._resolve(name)(**kwargs)
 
     @classmethod
     def get_registered_providers(cls):
-        """Returns a list of all registered provider names"""
-        return cls._registry.keys()
+        """Returns a tuple of all registered provider names"""
+        if (
+            cls._names_snapshot is None
+            or cls._names_source is not cls._registry
+            or len(cls._names_snapshot) != len(cls._registry)
+        ):
+            cls._names_snapshot = tuple(cls._registry)
+            cls._names_source = cls._registry
+        return cls._names_snapshot
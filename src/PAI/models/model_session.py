@@ -1,3 +1,7 @@
+import asyncio
+from typing import List, Optional
+
+from .batch import run_batch
 from .model_registry import ProviderRegistry
 
 from PAI.utils.logger import logger
@@ -16,3 +20,45 @@ class ModelSession:
         if not self.provider:
             raise RuntimeError("Session not initialized. Call init() first.")
         return self.provider.generate(prompt, **kwargs)
+
+    def generate_batch(
+        self,
+        prompts: List[str],
+        max_concurrency: int = 8,
+        rpm: Optional[float] = None,
+        use_batch_api: bool = False,
+        **kwargs,
+    ) -> List[str]:
+        """
+        Generate responses for several independent prompts, e.g. an evaluation run
+
+        Requests go through the provider's async client (or its generate on
+        worker threads) with at most max_concurrency in flight, optional
+        requests-per-minute pacing and backoff on rate limits. With
+        use_batch_api the prompts are instead submitted as one offline job
+        through the provider's batch_generate (cheaper, but it can take hours).
+        Responses are returned in prompt order.
+
+        Must be called outside a running event loop; async callers can await
+        run_batch directly.
+        """
+        if not self.provider:
+            raise RuntimeError("Session not initialized. Call init() first.")
+        if not prompts:
+            return []
+
+        if use_batch_api:
+            batch_generate = getattr(self.provider, "batch_generate", None)
+            if not callable(batch_generate):
+                raise ValueError("Provider does not support a batch API")
+            return batch_generate(prompts, **kwargs)
+
+        return asyncio.run(
+            run_batch(
+                self.provider,
+                prompts,
+                max_concurrency=max_concurrency,
+                rpm=rpm,
+                **kwargs,
+            )
+        )
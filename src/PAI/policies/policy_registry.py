@@ -1,9 +1,11 @@
 ﻿from typing import Dict, Optional, List, Any
 from pathlib import Path
-import json
 from datetime import datetime
 
 from PAI.utils.logger import logger
+from PAI.utils.json_io import dumps, loads
+
+_POLICY_TYPES = frozenset(("hard", "soft"))
 
 
 class PolicyRegistry:
@@ -21,13 +23,14 @@ class PolicyRegistry:
         path: Optional[Path] = None,
     ) -> Optional[Dict[str, Any]]:
 
-        if Policy_Type.lower() not in ["hard", "soft"]:
+        policy_type = Policy_Type.lower()
+        if policy_type not in _POLICY_TYPES:
             raise ValueError(
                 "Policy_Type must be either 'hard' or 'soft', case nonsensitive."
             )
-        if Policy_Type.lower() == "hard" and not Regex:
+        if policy_type == "hard" and not Regex:
             raise ValueError("Regex must be provided for 'hard' policies.")
-        if Policy_Type.lower() == "soft" and not Instructions:
+        if policy_type == "soft" and not Instructions:
             raise ValueError("Instructions must be provided for 'soft' policies.")
 
         try:
@@ -51,8 +54,7 @@ class PolicyRegistry:
             path = cls._prepare_path(path)
             path.parent.mkdir(parents=True, exist_ok=True)
 
-            with open(path, "w", encoding="utf-8") as f:
-                json.dump(policies, f, indent=2)
+            path.write_bytes(dumps(policies, indent=True))
 
             logger.info(f"Resource '{Name}' (ID: {policies}) added successfully")
             return policy_entry
@@ -104,10 +106,9 @@ class PolicyRegistry:
             path = cls._prepare_path(path)
             path.parent.mkdir(parents=True, exist_ok=True)
 
-            with open(path, "w", encoding="utf-8") as f:
-                json.dump(policies, f, indent=2)
-                logger.info(f"Policy '{Name}' updated successfully")
-                return updated_policies
+            path.write_bytes(dumps(policies, indent=True))
+            logger.info(f"Policy '{Name}' updated successfully")
+            return updated_policies
 
         except Exception as e:
             logger.error(f"Error updating policy '{Name}': {e}")
@@ -142,8 +143,7 @@ class PolicyRegistry:
         try:
             path.parent.mkdir(parents=True, exist_ok=True)
 
-            with open(path, "w", encoding="utf-8") as f:
-                json.dump(policies, f, indent=2)
+            path.write_bytes(dumps(policies, indent=True))
 
             logger.info(
                 f"Resource deleted successfully. Policies count: {initial_count} → {len(policies_list)}"
@@ -173,17 +173,13 @@ class PolicyRegistry:
         path = cls._prepare_path(path)
         policies = {"policies": []}
 
-        if not path.exists():
+        try:
+            return loads(path.read_bytes())
+        except FileNotFoundError:
             logger.debug(
                 f"Resources file not found at {path}, returning empty policies"
             )
             return policies
-
-        try:
-            with open(path, "r", encoding="utf-8") as f:
-                policies = f.read().strip()
-                return json.loads(policies)
-
         except Exception as e:
             logger.error(f"Error accessing resource location {path}: {e}")
             raise
@@ -1,11 +1,11 @@
-﻿import json
-import datetime
-from typing import Optional, List, Dict, Any, Union
+﻿import datetime
+from typing import Optional, List, Dict, Any, Tuple, Union
 import uuid
 from pathlib import Path
 from .resource_validator import Resource, ResourceCollection
 
 from PAI.utils.logger import logger
+from PAI.utils.json_io import dumps, loads, JSONDecodeError
 
 
 class ResourceRegistry:
@@ -13,6 +13,9 @@ class ResourceRegistry:
     Registry for managing resources.
     """
 
+    # Resource metadata per registry file, keyed on the file's (mtime_ns, size)
+    _metadata_cache: Dict[Path, Tuple[Tuple[int, int], List[Dict[str, Any]]]] = {}
+
     @classmethod
     def create_resource(
         cls,
@@ -73,8 +76,7 @@ class ResourceRegistry:
             path = cls._prepare_path(path)
             path.parent.mkdir(parents=True, exist_ok=True)
 
-            with open(path, "w", encoding="utf-8") as f:
-                json.dump(resources, f, indent=2)
+            path.write_bytes(dumps(resources, indent=True))
 
             logger.info(f"Resource '{Name}' (ID: {resource_id}) added successfully")
             return resource_entry
@@ -148,10 +150,9 @@ class ResourceRegistry:
             path = cls._prepare_path(path)
             path.parent.mkdir(parents=True, exist_ok=True)
 
-            with open(path, "w", encoding="utf-8") as f:
-                json.dump(resources, f, indent=2)
-                logger.info(f"Resource '{Name}' updated successfully")
-                return updated_resource
+            path.write_bytes(dumps(resources, indent=True))
+            logger.info(f"Resource '{Name}' updated successfully")
+            return updated_resource
 
         except Exception as e:
             logger.error(f"Error updating resource '{Name}': {e}")
@@ -189,8 +190,7 @@ class ResourceRegistry:
         try:
             path.parent.mkdir(parents=True, exist_ok=True)
 
-            with open(path, "w", encoding="utf-8") as f:
-                json.dump(resources, f, indent=2)
+            path.write_bytes(dumps(resources, indent=True))
 
             logger.info(
                 f"Resource deleted successfully. Resources count: {initial_count} → {len(resources_list)}"
@@ -255,34 +255,34 @@ class ResourceRegistry:
         path = cls._prepare_path(path)
         resources = {"resources": []}
 
-        if not path.exists():
+        try:
+            size = path.stat().st_size
+        except FileNotFoundError:
             logger.debug(
                 f"Resources file not found at {path}, returning empty resources"
             )
             return resources
 
         try:
-            with open(path, "r", encoding="utf-8") as f:
-                content_text = f.read().strip()
-                if content_text:
-                    try:
-                        resources_raw = json.loads(content_text)
-                        resources = ResourceCollection.model_validate(
-                            resources_raw
-                        ).model_dump()
-                        logger.debug(
-                            f"Loaded {len(resources.get('resources', []))} resources"
-                        )
-                    except Exception as validation_error:
-                        logger.error(f"Resource validation error: {validation_error}")
-                        raise
-                else:
+            # The JSON parser takes bytes directly; no text decode needed
+            content = path.read_bytes().strip() if size else b""
+            if content:
+                try:
+                    resources_raw = loads(content)
+                    resources = ResourceCollection.model_validate(
+                        resources_raw
+                    ).model_dump()
                     logger.debug(
-                        "Empty resources file, returning default empty structure"
+                        f"Loaded {len(resources.get('resources', []))} resources"
                     )
+                except Exception as validation_error:
+                    logger.error(f"Resource validation error: {validation_error}")
+                    raise
+            else:
+                logger.debug("Empty resources file, returning default empty structure")
             return resources
 
-        except json.JSONDecodeError:
+        except JSONDecodeError:
             logger.warning(
                 f"Invalid JSON in resource file: {path}, returning empty resources"
             )
@@ -293,7 +293,19 @@ class ResourceRegistry:
 
     @classmethod
     def get_resource_metadata(cls, path: Optional[Path] = None) -> List[Dict[str, Any]]:
-        """Get metadata for all resources except their Content."""
+        """
+        Get metadata for all resources except their Content.
+
+        The list is cached and shared between callers, so it must not be modified.
+        """
+
+        path = cls._prepare_path(path)
+        stat_key = cls.registry_stat(path)
+
+        cached = cls._metadata_cache.get(path)
+        if stat_key is not None and cached is not None and cached[0] == stat_key:
+            logger.debug(f"Using cached metadata for {len(cached[1])} resources")
+            return cached[1]
 
         resources = cls.get_resources(path)
 
@@ -301,10 +313,21 @@ class ResourceRegistry:
             {k: v for k, v in resource.items() if k != "Content"}
             for resource in resources.get("resources", [])
         ]
+        if stat_key is not None:
+            cls._metadata_cache[path] = (stat_key, metadata)
 
         logger.debug(f"Retrieved metadata for {len(metadata)} resources")
         return metadata
 
+    @classmethod
+    def registry_stat(cls, path: Optional[Path] = None) -> Optional[Tuple[int, int]]:
+        """(mtime_ns, size) of the registry file, or None if it doesn't exist."""
+        try:
+            st = cls._prepare_path(path).stat()
+        except FileNotFoundError:
+            return None
+        return st.st_mtime_ns, st.st_size
+
     @classmethod
     def _check_resource_exist(cls, Name: str) -> bool:
         """Check if a resource with the given name exists."""
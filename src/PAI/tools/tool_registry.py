@@ -1,5 +1,4 @@
 import inspect
-import json
 import logging
 from typing import Dict, Any, Callable, Optional, List
 
@@ -16,6 +15,8 @@ class ToolRegistry:
     """
 
     _tools = {}
+    # get_tools() result, rebuilt after the next registration
+    _tools_snapshot: Optional[List[Dict]] = None
 
     @classmethod
     def register(cls, name: str, description: str = None, params: Dict = None):
@@ -44,6 +45,7 @@ class ToolRegistry:
                 "description": description or func.__doc__ or "",
                 "parameters": parameters,
             }
+            cls._tools_snapshot = None
             logger.debug(f"Registered tool: {name}")
             return func
 
@@ -101,16 +103,19 @@ class ToolRegistry:
         Get all registered tool definitions in a generic format
 
         Returns:
-            List of tool definitions with name, description and parameters
+            List of tool definitions with name, description and parameters.
+            The list is shared between callers and must not be modified.
         """
-        return [
-            {
-                "name": name,
-                "description": info["description"],
-                "parameters": info["parameters"],
-            }
-            for name, info in cls._tools.items()
-        ]
+        if cls._tools_snapshot is None:
+            cls._tools_snapshot = [
+                {
+                    "name": name,
+                    "description": info["description"],
+                    "parameters": info["parameters"],
+                }
+                for name, info in cls._tools.items()
+            ]
+        return cls._tools_snapshot
 
     @classmethod
     def execute_tool(cls, name: str, args: Dict[str, Any]) -> Any:
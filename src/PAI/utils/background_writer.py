@@ -0,0 +1,151 @@
+import atexit
+import os
+import queue
+import threading
+from pathlib import Path
+from typing import BinaryIO, Callable, Dict, List, Optional
+
+from PAI.utils.logger import logger
+
+# Buffer size of the append handles; the queue is drained into it and flushed
+# once no more writes are waiting.
+_BUFFER_SIZE = 1 << 16
+
+
+class BackgroundWriter:
+    """
+    Appends bytes to files from a single daemon thread.
+
+    Writes are applied in the order they were queued, so callers can move
+    file I/O off their critical path without reordering the log. Each file is
+    opened once and kept open (and reopened if the path is replaced); queued
+    writes are coalesced in its buffer and flushed when the queue runs dry.
+    flush() blocks until everything queued so far is on disk, and re-raises
+    the first write failure since the last flush.
+    """
+
+    def __init__(self):
+        self._queue = queue.Queue()
+        self._thread = None
+        self._lock = threading.Lock()
+        self._handles: Dict[Path, BinaryIO] = {}
+        self._handles_lock = threading.Lock()
+        # First write failure not yet reported by flush()
+        self._error: Optional[Exception] = None
+
+    def append(
+        self,
+        path: Path,
+        data: bytes,
+        on_written: Optional[Callable[[], None]] = None,
+    ):
+        """Queue data to be appended to path; on_written runs after the write."""
+        self._ensure_started()
+        self._queue.put((path, data, on_written))
+
+    def flush(self):
+        """Block until all queued writes have been applied."""
+        if self._thread is not None:
+            self._queue.join()
+        error, self._error = self._error, None
+        if error is not None:
+            raise error
+
+    def close(self, *paths: Path):
+        """Flush, then close the handles for paths (all handles if none given)."""
+        try:
+            self.flush()
+        finally:
+            with self._handles_lock:
+                for path in paths or list(self._handles):
+                    handle = self._handles.pop(path, None)
+                    if handle is not None:
+                        handle.close()
+
+    def _ensure_started(self):
+        with self._lock:
+            if self._thread is None:
+                self._thread = threading.Thread(
+                    target=self._run, name="PAI-background-writer", daemon=True
+                )
+                self._thread.start()
+                atexit.register(self.close)
+
+    def _handle(self, path: Path, check_replaced: bool) -> BinaryIO:
+        handle = self._handles.get(path)
+        if handle is not None and check_replaced and self._replaced(path, handle):
+            self._drop_handle(path)
+            handle = None
+        if handle is None:
+            handle = open(path, "ab", buffering=_BUFFER_SIZE)
+            self._handles[path] = handle
+        return handle
+
+    @staticmethod
+    def _replaced(path: Path, handle: BinaryIO) -> bool:
+        """Whether path no longer names the file handle has open."""
+        try:
+            st = os.stat(path)
+        except FileNotFoundError:
+            return True
+        opened = os.fstat(handle.fileno())
+        return (st.st_dev, st.st_ino) != (opened.st_dev, opened.st_ino)
+
+    def _drop_handle(self, path: Path):
+        handle = self._handles.pop(path, None)
+        if handle is not None:
+            try:
+                handle.close()
+            except Exception:
+                # Its buffered bytes failed to write; that was already reported
+                pass
+
+    def _fail(self, path: Path, error: Exception):
+        logger.error(f"Failed to write to {path}: {error}")
+        if self._error is None:
+            self._error = error
+
+    def _run(self):
+        dirty: Dict[Path, BinaryIO] = {}
+        callbacks: List[Callable[[], None]] = []
+        pending = 0
+        while True:
+            path, data, on_written = self._queue.get()
+            pending += 1
+            try:
+                with self._handles_lock:
+                    # Check for a replaced file once per batch, not per write
+                    handle = self._handle(path, check_replaced=path not in dirty)
+                    handle.write(data)
+                dirty[path] = handle
+                if on_written is not None:
+                    callbacks.append(on_written)
+            except Exception as e:
+                self._fail(path, e)
+                with self._handles_lock:
+                    self._drop_handle(path)
+                dirty.pop(path, None)
+
+            if not self._queue.empty():
+                continue
+
+            # Nothing else is waiting: push the buffered bytes to the files
+            # before reporting the writes as done.
+            with self._handles_lock:
+                for dirty_path, handle in dirty.items():
+                    try:
+                        if not handle.closed:
+                            handle.flush()
+                    except Exception as e:
+                        self._fail(dirty_path, e)
+                        self._drop_handle(dirty_path)
+            for callback in callbacks:
+                try:
+                    callback()
+                except Exception as e:
+                    logger.error(f"Session write callback failed: {e}")
+            dirty.clear()
+            callbacks.clear()
+            for _ in range(pending):
+                self._queue.task_done()
+            pending = 0
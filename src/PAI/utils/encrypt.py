@@ -1,4 +1,5 @@
 from cryptography.fernet import Fernet
+from functools import lru_cache
 import os
 
 
@@ -9,11 +10,17 @@ def get_encryption_key():
     return key.encode()
 
 
+@lru_cache(maxsize=4)
+def _fernet(key):
+    # Keyed on the key itself, so changing PAI_ENCRYPTION_KEY takes effect
+    return Fernet(key)
+
+
 def encrypt_api_key(api_key):
-    f = Fernet(get_encryption_key())
+    f = _fernet(get_encryption_key())
     return f.encrypt(api_key.encode()).decode()
 
 
 def decrypt_api_key(encrypted):
-    f = Fernet(get_encryption_key())
+    f = _fernet(get_encryption_key())
     return f.decrypt(encrypted.encode()).decode()
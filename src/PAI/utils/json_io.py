@@ -0,0 +1,51 @@
+"""
+JSON helpers used on the hot paths (session log, tool/resource parsing).
+
+Uses orjson when it is installed and falls back to the standard library.
+`dumps` always returns bytes so callers can write straight to binary files.
+"""
+
+import json
+import re
+
+
+def _json_dumps(obj, indent: bool = False, sort_keys: bool = False) -> bytes:
+    if indent:
+        return json.dumps(obj, indent=2, sort_keys=sort_keys).encode("utf-8")
+    return json.dumps(obj, separators=(",", ":"), sort_keys=sort_keys).encode("utf-8")
+
+
+try:
+    import orjson
+
+    # orjson parses integers beyond 64 bits as floats, losing digits. Anything
+    # that long (19+ digits) goes to the standard library, which keeps ints exact.
+    _LONG_NUMBER = re.compile(r"\d{19}")
+    _LONG_NUMBER_BYTES = re.compile(rb"\d{19}")
+
+    # Subclasses json.JSONDecodeError, so catch the standard library's class
+    JSONDecodeError = json.JSONDecodeError
+
+    def loads(data):
+        pattern = _LONG_NUMBER if isinstance(data, str) else _LONG_NUMBER_BYTES
+        if pattern.search(data):
+            return json.loads(data)
+        return orjson.loads(data)
+
+    def dumps(obj, indent: bool = False, sort_keys: bool = False) -> bytes:
+        option = orjson.OPT_NON_STR_KEYS
+        if indent:
+            option |= orjson.OPT_INDENT_2
+        if sort_keys:
+            option |= orjson.OPT_SORT_KEYS
+        try:
+            return orjson.dumps(obj, option=option)
+        except TypeError:
+            # Tool results are arbitrary user data; orjson rejects some values
+            # the standard library accepts, such as integers beyond 64 bits
+            return _json_dumps(obj, indent=indent, sort_keys=sort_keys)
+
+except ImportError:
+    JSONDecodeError = json.JSONDecodeError
+    loads = json.loads
+    dumps = _json_dumps
@@ -0,0 +1,81 @@
+import mmap
+from collections.abc import Sequence
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from PAI.utils.json_io import dumps, loads
+
+
+class PromptHistory(Sequence):
+    """
+    Lazy view of one session instance's prompt history.
+
+    The history file is memory-mapped just long enough to pick out this
+    instance's lines, so loading a session doesn't parse every turn; a record
+    is decoded only when it is accessed. Records appended after loading are
+    kept in memory, since their writes to the file may still be queued.
+    """
+
+    def __init__(self, lines: Optional[List[bytes]] = None):
+        self._lines = lines or []
+        self._appended: List[Dict[str, Any]] = []
+
+    @classmethod
+    def load(cls, path: Path, session_start_dt) -> "PromptHistory":
+        """Collect the undecoded records of path tagged with session_start_dt."""
+        try:
+            with open(path, "rb") as f:
+                mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except (FileNotFoundError, ValueError):
+            # Missing or empty history file
+            return cls()
+
+        marker = b'"session_start_dt":' + dumps(session_start_dt)
+        lines = []
+        with mm:
+            start = 0
+            size = len(mm)
+            while start < size:
+                end = mm.find(b"\n", start)
+                if end == -1:
+                    end = size
+                if mm.find(marker, start, end) != -1:
+                    lines.append(mm[start:end])
+                start = end + 1
+        return cls(lines)
+
+    def _record(self, index: int) -> Dict[str, Any]:
+        record = loads(self._lines[index])
+        del record["session_start_dt"]
+        return record
+
+    def __len__(self) -> int:
+        return len(self._lines) + len(self._appended)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("prompt history index out of range")
+        if index < len(self._lines):
+            return self._record(index)
+        return self._appended[index - len(self._lines)]
+
+    def append(self, record: Dict[str, Any]):
+        self._appended.append(record)
+
+    def copy(self) -> "PromptHistory":
+        """A view sharing the loaded records but with its own appended records."""
+        history = PromptHistory(self._lines)
+        history._appended = list(self._appended)
+        return history
+
+    def __eq__(self, other) -> bool:
+        if isinstance(other, (PromptHistory, list)):
+            return len(self) == len(other) and list(self) == list(other)
+        return NotImplemented
+
+    def __repr__(self) -> str:
+        return f"PromptHistory({len(self)} records)"
@@ -0,0 +1,15 @@
+import sys
+
+import pytest
+
+import PAI.PAI  # noqa: F401 - loads the PAI.PAI module patched below
+
+
+@pytest.fixture(autouse=True)
+def session_dir(tmp_path, monkeypatch):
+    """Keep session logs written by tests out of the real ~/.PAI"""
+    # The package binds PAI.PAI to the class, so patch the module object itself
+    module = sys.modules["PAI.PAI"]
+    monkeypatch.setattr(module, "_SESSION_DIR", tmp_path)
+    monkeypatch.setattr(module, "_SESSION_DIR_READY", False)
+    return tmp_path
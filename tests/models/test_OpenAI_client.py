@@ -43,3 +43,59 @@ def test_OpenAI_client_generate_2():
     client = OpenAIClient(api_key="test-key")
     with pytest.raises(ValueError, match="Prompt cannot be empty"):
         client.generate("   ")
+
+
+def test_OpenAI_client_batch_generate_1(mocker):
+    """Test batch results are mapped back to prompt order by custom_id"""
+    client = OpenAIClient(api_key="test-key")
+    files = mocker.patch.object(client.client, "files")
+    batches = mocker.patch.object(client.client, "batches")
+    files.create.return_value = mocker.Mock(id="file-in")
+    batches.create.return_value = mocker.Mock(id="batch-1", status="in_progress")
+    batches.retrieve.return_value = mocker.Mock(
+        id="batch-1", status="completed", output_file_id="file-out"
+    )
+    files.content.return_value.content = (
+        b'{"custom_id": "1", "response": {"status_code": 200, "body": '
+        b'{"choices": [{"message": {"content": " second "}}]}}}\n'
+        b'{"custom_id": "0", "response": {"status_code": 200, "body": '
+        b'{"choices": [{"message": {"content": "first"}}]}}}\n'
+    )
+    mocker.patch("PAI.models.OpenAI_client.time.sleep")
+
+    responses = client.batch_generate(["one", "two", "three"], temperature=0)
+
+    assert responses == ["first", "second", None]
+    submitted = files.create.call_args.kwargs["file"][1].splitlines()
+    assert len(submitted) == 3
+    assert b'"temperature":0' in submitted[0]
+
+
+def test_OpenAI_client_completions_batch_1(mocker):
+    """Test several prompts share one Completions request"""
+    client = OpenAIClient(api_key="test-key", model="gpt-3.5-turbo-instruct")
+    completions = mocker.patch.object(client.client, "completions")
+    completions.create.return_value = mocker.Mock(
+        choices=[mocker.Mock(index=1, text=" two"), mocker.Mock(index=0, text="one")]
+    )
+
+    assert client.completions_batch(["1", "2"], n=3, temperature=0) == ["one", "two"]
+    completions.create.assert_called_once_with(
+        model="gpt-3.5-turbo-instruct", prompt=["1", "2"], max_tokens=300, temperature=0
+    )
+
+
+def test_OpenAI_client_generate_samples_1(mocker):
+    """Test n samples come back from a single chat request"""
+    mock_create = mocker.patch("openai.resources.chat.Completions.create")
+    mock_create.return_value = mocker.Mock(
+        choices=[
+            mocker.Mock(message=mocker.Mock(content="a")),
+            mocker.Mock(message=mocker.Mock(content="b ")),
+        ]
+    )
+
+    client = OpenAIClient(api_key="test-key")
+
+    assert client.generate_samples("Test prompt", n=2) == ["a", "b"]
+    assert mock_create.call_args.kwargs["n"] == 2
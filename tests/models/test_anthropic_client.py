@@ -1,3 +1,5 @@
+import asyncio
+
 import pytest
 from PAI.models.Anthropic_client import AnthropicClient
 
@@ -38,3 +40,74 @@ def test_Anthropic_client_generate_2():
     client = AnthropicClient(api_key="test-key")
     with pytest.raises(ValueError, match="Prompt cannot be empty"):
         client.generate("   ")
+
+
+def test_Anthropic_client_generate_3(mocker):
+    """Test the system prompt is sent as a cacheable block"""
+
+    class MockText:
+        text = "Test response"
+
+    class MockResponse:
+        content = [MockText()]
+
+    client = AnthropicClient(api_key="test-key")
+    create = mocker.patch.object(
+        client.client.messages, "create", return_value=MockResponse()
+    )
+
+    client.generate("Test prompt")
+    client.generate("Test prompt", system="Be brief")
+
+    default_system = create.call_args_list[0].kwargs["system"]
+    assert default_system[0]["cache_control"] == {"type": "ephemeral"}
+    assert create.call_args_list[1].kwargs["system"] == [
+        {"type": "text", "text": "Be brief", "cache_control": {"type": "ephemeral"}}
+    ]
+
+
+def test_Anthropic_client_agenerate_1(mocker):
+    """Test agenerate sends the same parameters through the async client"""
+
+    class MockText:
+        text = "Async response"
+
+    class MockResponse:
+        content = [MockText()]
+
+    async_client = mocker.patch("PAI.models.Anthropic_client.anthropic.AsyncAnthropic")
+    create = async_client.return_value.messages.create = mocker.AsyncMock(
+        return_value=MockResponse()
+    )
+    client = AnthropicClient(api_key="test-key")
+
+    async def run():
+        return [await client.agenerate("Test prompt") for _ in range(2)]
+
+    assert asyncio.run(run()) == ["Async response", "Async response"]
+    async_client.assert_called_once_with(api_key="test-key")
+    assert create.call_args.kwargs["messages"] == [
+        {"role": "user", "content": "Test prompt"}
+    ]
+
+
+def test_Anthropic_client_batch_generate_1(mocker):
+    """Test only succeeded batch results are returned, in prompt order"""
+    client = AnthropicClient(api_key="test-key")
+    batches = mocker.patch.object(client.client.messages, "batches")
+    batches.create.return_value = mocker.Mock(id="batch-1", processing_status="ended")
+
+    def result(custom_id, type, text=None):
+        entry = mocker.Mock(custom_id=custom_id)
+        entry.result.type = type
+        entry.result.message.content = [mocker.Mock(text=text)]
+        return entry
+
+    batches.results.return_value = [
+        result("1", "succeeded", "second"),
+        result("0", "errored"),
+    ]
+
+    assert client.batch_generate(["one", "two"]) == [None, "second"]
+    requests = batches.create.call_args.kwargs["requests"]
+    assert [r["custom_id"] for r in requests] == ["0", "1"]
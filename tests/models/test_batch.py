@@ -0,0 +1,81 @@
+import asyncio
+
+import httpx
+import openai
+import pytest
+
+from PAI.models.batch import run_batch
+
+
+class RateLimitError(Exception):
+    status_code = 429
+
+
+def test_batch_run_batch_1():
+    """Test responses keep prompt order and concurrency stays bounded"""
+
+    class AsyncProvider:
+        active = 0
+        peak = 0
+
+        async def agenerate(self, prompt, **kwargs):
+            AsyncProvider.active += 1
+            AsyncProvider.peak = max(AsyncProvider.peak, AsyncProvider.active)
+            await asyncio.sleep(0.01 if prompt == "0" else 0)
+            AsyncProvider.active -= 1
+            return f"Response to: {prompt}"
+
+    prompts = [str(i) for i in range(10)]
+    responses = asyncio.run(run_batch(AsyncProvider(), prompts, max_concurrency=3))
+
+    assert responses == [f"Response to: {p}" for p in prompts]
+    assert AsyncProvider.peak <= 3
+
+
+def test_batch_run_batch_2():
+    """Test rate-limited requests are retried and other errors raised"""
+
+    class FlakyProvider:
+        calls = 0
+
+        async def agenerate(self, prompt, **kwargs):
+            FlakyProvider.calls += 1
+            if prompt == "bad":
+                raise ValueError("Prompt cannot be empty")
+            if FlakyProvider.calls < 3:
+                raise RateLimitError()
+            return "ok"
+
+    assert asyncio.run(run_batch(FlakyProvider(), ["hi"], backoff=0)) == ["ok"]
+    assert FlakyProvider.calls == 3
+
+    with pytest.raises(ValueError):
+        asyncio.run(run_batch(FlakyProvider(), ["bad"], backoff=0))
+
+
+def test_batch_run_batch_3():
+    """Test providers without agenerate fall back to generate on threads"""
+
+    class SyncProvider:
+        def generate(self, prompt, **kwargs):
+            return f"{prompt}:{kwargs['temperature']}"
+
+    responses = asyncio.run(run_batch(SyncProvider(), ["a", "b"], temperature=0))
+    assert responses == ["a:0", "b:0"]
+
+
+def test_batch_run_batch_4():
+    """Test SDK connection errors without a status code are retried"""
+    request = httpx.Request("POST", "https://api.openai.com/v1/chat/completions")
+
+    class FlakyProvider:
+        calls = 0
+
+        async def agenerate(self, prompt, **kwargs):
+            FlakyProvider.calls += 1
+            if FlakyProvider.calls == 1:
+                raise openai.APIConnectionError(request=request)
+            return "ok"
+
+    assert asyncio.run(run_batch(FlakyProvider(), ["hi"], backoff=0)) == ["ok"]
+    assert FlakyProvider.calls == 2
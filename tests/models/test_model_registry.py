@@ -53,3 +53,40 @@ def test_model_registry_get_registered_providers_1():
 
     providers = ProviderRegistry.get_registered_providers()
     assert set(providers) == {"provider1", "provider2"}
+    assert ProviderRegistry.get_registered_providers() is providers
+
+    @ProviderRegistry.register("provider3")
+    class Provider3:
+        pass
+
+    assert "provider3" in ProviderRegistry.get_registered_providers()
+
+
+def test_model_registry_get_registered_providers_2():
+    """Test the provider names follow a replaced or directly edited registry"""
+    ProviderRegistry._registry = {"provider1": object}
+    assert ProviderRegistry.get_registered_providers() == ("provider1",)
+
+    ProviderRegistry._registry = {"provider2": object}
+    assert ProviderRegistry.get_registered_providers() == ("provider2",)
+
+    ProviderRegistry._registry["provider3"] = object
+    assert ProviderRegistry.get_registered_providers() == ("provider2", "provider3")
+
+    del ProviderRegistry._registry["provider2"]
+    assert ProviderRegistry.get_registered_providers() == ("provider3",)
+
+
+def test_model_registry_register_lazy_1():
+    """Test a lazily registered provider is imported on first use"""
+    ProviderRegistry._registry = {}
+
+    ProviderRegistry.register_lazy("lazy_provider", "collections:OrderedDict")
+    assert ProviderRegistry._registry["lazy_provider"] == "collections:OrderedDict"
+
+    provider = ProviderRegistry.get_provider("lazy_provider", param="value")
+
+    from collections import OrderedDict
+
+    assert isinstance(provider, OrderedDict)
+    assert ProviderRegistry._registry["lazy_provider"] is OrderedDict
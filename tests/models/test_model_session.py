@@ -59,3 +59,63 @@ def test_session_generate_2():
 
     with pytest.raises(RuntimeError, match="Session not initialized"):
         session.generate("This should fail")
+
+
+def test_session_generate_batch_1():
+    """Test batch generation returns responses in prompt order"""
+    ProviderRegistry._registry = {}
+
+    @ProviderRegistry.register("test_provider")
+    class TestProvider:
+        def generate(self, prompt, **kwargs):
+            return f"Response to: {prompt}"
+
+    session = ModelSession()
+    session.init("test_provider")
+
+    responses = session.generate_batch(["one", "two", "three"])
+
+    assert responses == [
+        "Response to: one",
+        "Response to: two",
+        "Response to: three",
+    ]
+
+
+def test_session_generate_batch_3():
+    """Test batch generation uses the provider's async client when it has one"""
+    ProviderRegistry._registry = {}
+
+    @ProviderRegistry.register("test_provider")
+    class TestProvider:
+        async def agenerate(self, prompt, **kwargs):
+            return f"Response to: {prompt}"
+
+    session = ModelSession()
+    session.init("test_provider")
+
+    assert session.generate_batch(["one", "two"], max_concurrency=1) == [
+        "Response to: one",
+        "Response to: two",
+    ]
+
+
+def test_session_generate_batch_2():
+    """Test use_batch_api routes the prompts to the provider's batch API"""
+    ProviderRegistry._registry = {}
+
+    @ProviderRegistry.register("test_provider")
+    class TestProvider:
+        def generate(self, prompt, **kwargs):
+            raise AssertionError("generate should not be called")
+
+        def batch_generate(self, prompts, **kwargs):
+            return [f"Batched: {prompt}" for prompt in prompts]
+
+    session = ModelSession()
+    session.init("test_provider")
+
+    assert session.generate_batch(["one", "two"], use_batch_api=True) == [
+        "Batched: one",
+        "Batched: two",
+    ]
@@ -172,3 +172,19 @@ def test_resource_registry_get_toolmetadata_1(test_dir):
     assert "Content" not in result[0]
     assert "Tags" in result[0]
     assert len(result[0]["Tags"]) == 2
+
+
+def test_resource_registry_get_toolmetadata_2(test_dir):
+    """Test resource metadata is reused until the resources file changes"""
+    ResourceRegistry.create_resource(
+        Name="metadata_test", content="Content", Description="Test description"
+    )
+
+    result = ResourceRegistry.get_resource_metadata()
+    assert ResourceRegistry.get_resource_metadata() is result
+
+    ResourceRegistry.create_resource(
+        Name="metadata_test_2", content="Content", Description="Test description"
+    )
+
+    assert len(ResourceRegistry.get_resource_metadata()) == 2
@@ -1,4 +1,10 @@
+import threading
+import time
+
 from PAI.PAI import PAI
+from PAI.cache import LLMCache
+from PAI.utils.json_io import dumps
+from PAI.utils.prompt_history import PromptHistory
 import pytest
 
 
@@ -10,6 +16,23 @@ def mock_provider(mocker):
     return provider
 
 
+@pytest.fixture
+def saved_session():
+    """Factory for a PAI whose session header and instances are already on disk"""
+
+    def make(*instances, session_name="Test_Session"):
+        pai = PAI(session_name)
+        pai.session_log = {
+            "session_name": session_name,
+            "session_instance": list(instances),
+        }
+        pai._write_session_meta()
+        pai.save_session()
+        return pai
+
+    return make
+
+
 @pytest.fixture
 def test_PAI_init_1(mock_provider, mocker):
     """Test PAI initialization with mock provider"""
@@ -49,6 +72,20 @@ def test_PAI_use_provider_1(mocker):
     assert result is pai
 
 
+def test_PAI_use_provider_2(mocker):
+    """Test use_provider only re-initializes when the provider or its args change"""
+    pai = PAI("Test_Session")
+    mock_init = mocker.patch.object(pai.model_session, "init")
+    pai.model_session.provider = mocker.MagicMock(model="test-model")
+
+    pai.use_provider("test-provider", model="test-model")
+    pai.use_provider("test-provider", model="test-model")
+    assert mock_init.call_count == 1
+
+    pai.use_provider("test-provider", model="other-model")
+    assert mock_init.call_count == 2
+
+
 def test_PAI_use_openai_1(mocker):
     """Test use_openai method"""
     pai = PAI("Test_Session")
@@ -64,3 +101,451 @@ def test_PAI_use_openai_1(mocker):
     assert pai.current_provider == "openai"
     assert pai.current_model == "gpt-4"
     assert result is pai
+
+
+def test_PAI_save_session_1(saved_session):
+    """Test save_session appends one line per instance and get_session_log reads the last"""
+    pai = saved_session({"provider": "mock", "model": "m1", "prompt_history": []})
+    pai.session_log["session_instance"][-1]["model"] = "m2"
+    pai.save_session()
+    pai.flush()
+
+    assert len(pai.session_file.read_text().splitlines()) == 2
+
+    session_log = pai.get_session_log()
+    assert session_log["session_name"] == "Test_Session"
+    assert session_log["session_instance"][-1]["model"] == "m2"
+
+
+def test_PAI_add_prompt_1(saved_session):
+    """Test add_prompt appends to the history file and get_session_log reads it back"""
+    pai = saved_session(
+        {"session_start_dt": "t1", "provider": "mock", "prompt_history": []}
+    )
+    pai.add_prompt("Hi", "Hello", [], [])
+    pai.add_prompt("2+2?", "4", [], [])
+    pai.flush()
+
+    assert len(pai.session_file.read_bytes().splitlines()) == 1
+    assert b"prompt_history" not in pai.session_file.read_bytes()
+    assert len(pai.history_file.read_bytes().splitlines()) == 2
+
+    reader = PAI("Test_Session")
+    history = reader.get_session_log()["session_instance"][-1]["prompt_history"]
+    assert [h["response"] for h in history] == ["Hello", "4"]
+
+
+def test_PAI_close_1():
+    """Test close flushes pending writes and later saves reopen the log"""
+    pai = PAI("Test_Session")
+    pai.session_log = {
+        "session_name": "Test_Session",
+        "session_instance": [{"provider": "mock", "prompt_history": []}],
+    }
+    pai.save_session()
+    pai.close()
+    assert len(pai.session_file.read_bytes().splitlines()) == 1
+
+    pai.save_session()
+    pai.close()
+    assert len(pai.session_file.read_bytes().splitlines()) == 2
+
+
+def test_PAI_get_session_log_1(saved_session, mocker):
+    """Test get_session_log reuses the parsed log while the file is unchanged"""
+    pai = saved_session({"provider": "mock", "model": "m1", "prompt_history": []})
+
+    reader = PAI("Test_Session")
+    first = reader.get_session_log()
+    spy = mocker.spy(PAI, "_read_last_instance")
+    assert reader.get_session_log() is first
+    spy.assert_not_called()
+
+    pai.session_log["session_instance"][-1]["model"] = "m2"
+    pai.save_session()
+    assert reader.get_session_log()["session_instance"][-1]["model"] == "m2"
+
+
+def test_PAI_get_session_log_3():
+    """Test a legacy .json session is imported into the JSONL layout once"""
+    pai = PAI("Old")
+    first = {"session_start_dt": "t1", "provider": "mock", "model": "m1"}
+    pai.legacy_session_file.write_bytes(
+        dumps(
+            {
+                "session_name": "Old",
+                "session_instance": [
+                    {**first, "prompt_history": []},
+                    {**first, "prompt_history": [{"prompt": "Hi"}]},
+                    {**first, "session_start_dt": "t2", "model": "m2"},
+                ],
+            }
+        )
+    )
+
+    session_log = pai.get_session_log()
+
+    assert session_log["session_name"] == "Old"
+    assert session_log["session_instance"][-1]["model"] == "m2"
+    assert len(pai.session_file.read_bytes().splitlines()) == 2
+    assert pai.legacy_session_file.exists()
+
+    # The history of each instance moves to the history file
+    assert len(pai.history_file.read_bytes().splitlines()) == 1
+    assert list(PromptHistory.load(pai.history_file, "t1")) == [{"prompt": "Hi"}]
+
+
+def test_PAI_load_session_1(saved_session, mocker):
+    """Test load_session appends a new instance to the log it just read"""
+    pai = saved_session({"provider": "mock", "model": "m1", "prompt_history": []})
+
+    mocker.patch.object(PAI, "recreate_session")
+    pai.load_session("Test_Session")
+    pai.flush()
+
+    instances = pai.session_log["session_instance"]
+    assert len(instances) == 2
+    assert instances[-1]["model"] == "m1"
+    assert len(pai.session_file.read_bytes().splitlines()) == 2
+
+
+def test_PAI_get_session_log_4(saved_session, mocker):
+    """Test another instance's write isn't hidden by this instance's own appends"""
+    saved_session({"session_start_dt": "t1", "provider": "mock", "model": "m1"})
+    mocker.patch.object(PAI, "recreate_session")
+
+    first = PAI("Test_Session")
+    first.get_session_log()
+    second = PAI("Test_Session")
+    second.load_session("Test_Session", model="m2")
+
+    first.add_prompt("Hi", "Hello", [], [])
+    first.flush()
+
+    assert first.get_session_log()["session_instance"][-1]["model"] == "m2"
+
+    # With no other writer, this instance's own appends keep its cache valid
+    first.add_prompt("2+2?", "4", [], [])
+    first.flush()
+    spy = mocker.spy(PAI, "_parse_session_log")
+    history = first.get_session_log()["session_instance"][-1]["prompt_history"]
+    assert [h["response"] for h in history] == ["4"]
+    spy.assert_not_called()
+
+
+def test_PAI_generate_cache_1(mock_provider):
+    """Test deterministic generations are served from the cache"""
+    pai = PAI("Test_Session")
+    pai.tool_enabled = False
+    pai.model_session.provider = mock_provider
+    pai.current_model = "mock-model"
+
+    assert pai.generate("Hello", temperature=0) == "Mock response"
+    assert pai.generate("Hello", temperature=0) == "Mock response"
+    assert mock_provider.generate.call_count == 1
+
+    pai.generate("Hello", temperature=0.7)
+    assert mock_provider.generate.call_count == 2
+
+
+def test_PAI_generate_cache_2(mock_provider):
+    """Test parameters that can't be serialized bypass the cache"""
+
+    class Timeout:
+        pass
+
+    timeout = Timeout()
+    pai = PAI("Test_Session")
+    pai.tool_enabled = False
+    pai.model_session.provider = mock_provider
+
+    assert not LLMCache.is_cacheable({"timeout": timeout})
+    assert pai.generate("Hello", timeout=timeout) == "Mock response"
+    assert pai.generate("Hello", timeout=timeout) == "Mock response"
+    assert mock_provider.generate.call_count == 2
+    assert mock_provider.generate.call_args.kwargs["timeout"] is timeout
+
+
+def test_PAI_generate_context_1(mock_provider, mocker):
+    """Test the prompt context is rebuilt only when the session instance changes"""
+    pai = PAI("Test_Session")
+    pai.model_session.provider = mock_provider
+    pai.session_log = {
+        "session_name": "Test_Session",
+        "session_instance": [{"tool_metadata": [], "prompt_history": []}],
+    }
+    spy = mocker.spy(pai.context, "create_prompt_context")
+
+    pai.generate("First", temperature=0.5)
+    pai.add_prompt("First", "Mock response", [], [])
+    pai.generate("Second", temperature=0.5)
+    assert spy.call_count == 1
+
+    pai._session_log_version += 1
+    pai.generate("Third", temperature=0.5)
+    assert spy.call_count == 2
+    pai.flush()
+
+
+def test_PAI_extract_tool_calls_1():
+    """Test tool requests are extracted from a response"""
+    pai = PAI("Test_Session")
+    response = 'Tool Request(s):\n{\n  "name": "sum2num",\n  "args": {"a": 1, "b": 2}\n}'
+
+    assert pai._extract_tool_calls(response) == [
+        {"name": "sum2num", "args": {"a": 1, "b": 2}}
+    ]
+    assert pai._extract_tool_calls("No tools needed.") == []
+
+
+def test_PAI_extract_resource_call_1():
+    """Test resource requests are extracted from a response"""
+    pai = PAI("Test_Session")
+    response = 'Request Resource(s):\n{"Name": "example_resource", "ID": "123"}'
+
+    assert pai._extract_resouce_call(response) == [
+        {"Name": "example_resource", "ID": "123"}
+    ]
+
+
+def test_PAI_save_session_2(monkeypatch, mocker):
+    """Test the API key is encrypted once and round-trips through the session log"""
+    from cryptography.fernet import Fernet
+
+    monkeypatch.setenv("PAI_ENCRYPTION_KEY", Fernet.generate_key().decode())
+    pai = PAI("Test_Session")
+    mocker.patch.object(PAI, "use_provider")
+    encrypt = mocker.spy(PAI, "_encrypt_api_key")
+
+    pai.init_session("Test_Session", "mock", "mock-model", api_key="secret-key")
+    pai.save_session()
+
+    pai.flush()
+    assert encrypt.call_count == 1
+    assert "secret-key" not in pai.session_file.read_text()
+
+    reader = PAI("Test_Session")
+    assert reader.get_session_log()["session_instance"][-1]["api_key"] == "secret-key"
+
+
+def test_PAI_call_tools_1(mocker):
+    """Test tool results keep request order, including invalid requests"""
+    pai = PAI("Test_Session")
+    mocker.patch(
+        "PAI.PAI.ToolRegistry.execute_tool",
+        side_effect=lambda name, args: {"func_name": name, "func_args": args},
+    )
+
+    results = pai.call_tools(
+        [
+            {"name": "tool1", "args": {"a": 1}},
+            {"name": "missing_args"},
+            {"name": "tool2", "args": {}},
+        ]
+    )
+
+    assert results == [
+        {"func_name": "tool1", "func_args": {"a": 1}},
+        {"error": "Invalid tool request format"},
+        {"func_name": "tool2", "func_args": {}},
+    ]
+
+
+def test_PAI_evaluate_response_1(mock_provider, mocker):
+    """Test tool and resource requests are run at the same time"""
+    pai = PAI("Test_Session")
+    pai.model_session.provider = mock_provider
+    # Each side waits for the other, so running them one after another fails
+    barrier = threading.Barrier(2, timeout=5)
+
+    def execute_tool(name, args):
+        barrier.wait()
+        return {"func_name": name}
+
+    def get_resource(name, resource_id):
+        barrier.wait()
+        return {"Content": "resource text"}
+
+    mocker.patch("PAI.PAI.ToolRegistry.execute_tool", side_effect=execute_tool)
+    mocker.patch("PAI.PAI.ResourceRegistry.get_resource", side_effect=get_resource)
+
+    response = (
+        '{"name": "sum2num", "args": {"a": 1}}\n{"Name": "example_resource", "ID": "1"}'
+    )
+    final, tools_used, resources_used = pai.evaluate_response("Question", response)
+
+    assert final == "Mock response"
+    assert tools_used == [{"name": "sum2num", "args": {"a": 1}}]
+    assert resources_used == [{"Name": "example_resource", "ID": "1"}]
+    assert "resource text" in mock_provider.generate.call_args[0][0]
+
+
+def test_PAI_extract_tool_calls_2():
+    """Test repeated tool requests are only extracted once, whatever their formatting"""
+    pai = PAI("Test_Session")
+    response = (
+        'Tool Request(s):\n{"name": "sum2num", "args": {"a": 1, "b": 2}}\n'
+        'Tool Request(s):\n{"name":"sum2num", "args": {"b": 2, "a": 1}}'
+    )
+
+    assert pai._extract_tool_calls(response) == [
+        {"name": "sum2num", "args": {"a": 1, "b": 2}}
+    ]
+
+
+def test_PAI_extract_tool_calls_3():
+    """Test tool requests with nested args and braces inside strings are extracted"""
+    pai = PAI("Test_Session")
+    response = (
+        "Sure { let me check.\n"
+        'Tool Request(s):\n{"name": "write", "args": {"text": "a } b", "opts": {"x": 1}}}'
+    )
+
+    assert pai._extract_tool_calls(response) == [
+        {"name": "write", "args": {"text": "a } b", "opts": {"x": 1}}}
+    ]
+
+
+def test_PAI_extract_tool_calls_4():
+    """Test escaped quotes and backslashes inside strings don't end the request early"""
+    pai = PAI("Test_Session")
+    response = r'{"name": "write", "args": {"text": "say \"}\" and C:\\"}} done }'
+
+    assert pai._extract_tool_calls(response) == [
+        {"name": "write", "args": {"text": 'say "}" and C:\\'}}
+    ]
+    assert pai._extract_tool_calls('{"name": "write", "args": {"text": "open') == []
+
+
+def test_PAI_extract_tool_calls_5():
+    """Test thousands of unbalanced braces are scanned in linear time"""
+    pai = PAI("Test_Session")
+    response = (
+        '{"name": "x", "args": '
+        + "{ " * 10000
+        + '\n{"name": "sum2num", "args": {"a": 1, "b": 2}}'
+    )
+
+    start = time.perf_counter()
+    tool_calls = pai._extract_tool_calls(response)
+
+    assert time.perf_counter() - start < 1
+    assert tool_calls == [{"name": "sum2num", "args": {"a": 1, "b": 2}}]
+
+
+def test_PAI_call_resources_1(mocker):
+    """Test repeated resource requests in a session are served from the cache until the ttl"""
+    pai = PAI("Test_Session")
+    get_resource = mocker.patch(
+        "PAI.PAI.ResourceRegistry.get_resource",
+        side_effect=lambda name, resource_id: {"Name": name, "Content": "text"},
+    )
+
+    request = [{"Name": "example_resource", "ID": "1"}]
+    assert pai.call_resources(request) == pai.call_resources(request)
+    assert get_resource.call_count == 1
+
+    pai.resource_cache_ttl = 0
+    pai.call_resources(request)
+    assert get_resource.call_count == 2
+
+
+def test_PAI_call_resources_2(mocker):
+    """Test cached resources are refetched once the resource registry is rewritten"""
+    pai = PAI("Test_Session")
+    get_resource = mocker.patch(
+        "PAI.PAI.ResourceRegistry.get_resource",
+        side_effect=lambda name, resource_id: {"Name": name, "Content": "text"},
+    )
+    registry_stat = mocker.patch(
+        "PAI.PAI.ResourceRegistry.registry_stat", return_value=(1, 10)
+    )
+
+    request = [{"Name": "example_resource", "ID": "1"}]
+    pai.call_resources(request)
+    pai.call_resources(request)
+    assert get_resource.call_count == 1
+
+    registry_stat.return_value = (2, 12)
+    pai.call_resources(request)
+    assert get_resource.call_count == 2
+
+
+def test_PAI_evaluate_response_2(mock_provider, mocker):
+    """Test responses without enabled requests are returned unchanged"""
+    pai = PAI("Test_Session")
+    pai.model_session.provider = mock_provider
+    execute_tool = mocker.patch("PAI.PAI.ToolRegistry.execute_tool")
+
+    assert pai.evaluate_response("Question", "Plain answer") == "Plain answer"
+
+    pai.tool_enabled = False
+    response = '{"name": "sum2num", "args": {"a": 1}}'
+    assert pai.evaluate_response("Question", response) == response
+    execute_tool.assert_not_called()
+    mock_provider.generate.assert_not_called()
+
+
+def test_PAI_evaluate_response_3(mock_provider, mocker):
+    """Test integers beyond 64 bits and int keys survive the tool round trip"""
+    pai = PAI("Test_Session")
+    pai.model_session.provider = mock_provider
+    execute_tool = mocker.patch(
+        "PAI.PAI.ToolRegistry.execute_tool", return_value={1: "a", "n": 2**64}
+    )
+
+    response = '{"name": "sum2num", "args": {"a": 99999999999999999999, "b": -1}}'
+    final, tools_used, _ = pai.evaluate_response("Question", response)
+
+    assert final == "Mock response"
+    execute_tool.assert_called_once_with(
+        "sum2num", {"a": 99999999999999999999, "b": -1}
+    )
+    assert tools_used[0]["args"]["a"] == 99999999999999999999
+    prompt = mock_provider.generate.call_args[0][0]
+    assert '"1":"a"' in prompt
+    assert str(2**64) in prompt
+
+
+def test_PAI_status_1(saved_session):
+    """Test status reports the loaded session instance"""
+    assert PAI("Test_Session").status()["session_name"] is None
+
+    saved_session({"session_start_dt": "t1", "provider": "mock", "model": "m1"})
+
+    reader = PAI("Test_Session")
+    reader.get_session_log()
+
+    status = reader.status()
+    assert status["session_name"] == "Test_Session"
+    assert status["session_start_dt"] == "t1"
+    assert status["initialized"] is False
+    assert "api_key" not in status
+
+
+def test_PAI_get_session_log_2(saved_session, mocker):
+    """Test a parsed session log is shared across PAI instances until the file changes"""
+    pai = saved_session({"session_start_dt": "t1", "model": "m1"})
+
+    first = PAI("Test_Session").get_session_log()
+    spy = mocker.spy(PAI, "_read_last_instance")
+    second = PAI("Test_Session").get_session_log()
+    spy.assert_not_called()
+    assert second["session_instance"][-1] == first["session_instance"][-1]
+    assert second["session_instance"][-1] is not first["session_instance"][-1]
+
+    pai.add_prompt("Hi", "Hello", [], [])
+    log = PAI("Test_Session").get_session_log()
+    history = log["session_instance"][-1]["prompt_history"]
+    assert len(history) == 1
+    assert spy.call_count == 1
+
+
+def test_PAI_package_1():
+    """Test the package exposes the PAI class even after importing the PAI.PAI submodule"""
+    import importlib
+
+    package = importlib.import_module("PAI")
+    importlib.import_module("PAI.PAI")
+
+    assert package.PAI is PAI
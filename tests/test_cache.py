@@ -0,0 +1,83 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from PAI.cache import LLMCache, MemoryLRU, SQLiteBackend
+
+
+def test_cache_memory_lru_1():
+    """Test the LRU evicts the least recently used entry"""
+    lru = MemoryLRU(max_entries=2)
+    lru.set("a", "1")
+    lru.set("b", "2")
+    assert lru.get("a") == "1"
+    lru.set("c", "3")
+
+    assert lru.get("b") is None
+    assert lru.get("a") == "1"
+    assert lru.get("c") == "3"
+
+
+def test_cache_sqlite_backend_1(tmp_path):
+    """Test responses persist in the SQLite backend and expire after their ttl"""
+    path = tmp_path / "cache.db"
+    backend = SQLiteBackend(path)
+    backend.set("key", "response", model="m1", provider="mock", prompt="Hi")
+    backend.set("old", "stale", ttl=-1)
+    backend.close()
+
+    reopened = SQLiteBackend(path)
+    assert reopened.get("key") == "response"
+    assert reopened.get("old") is None
+    reopened.delete("key")
+    assert reopened.get("key") is None
+
+
+def test_cache_llm_cache_1():
+    """Test keys ignore whitespace and parameter order but not the model"""
+    key = LLMCache.cache_key("m1", "What is  2+2?", {"max_tokens": 5, "top_p": 1})
+
+    assert key == LLMCache.cache_key(
+        "m1", " What is 2+2?\n", {"top_p": 1, "max_tokens": 5}
+    )
+    assert key != LLMCache.cache_key(
+        "m2", "What is 2+2?", {"max_tokens": 5, "top_p": 1}
+    )
+    assert LLMCache.is_cacheable({}) and LLMCache.is_cacheable({"temperature": 0})
+    assert not LLMCache.is_cacheable({"temperature": 0.7})
+
+
+def test_cache_llm_cache_2():
+    """Test semantic mode serves a similar prompt for the same model only"""
+    vectors = {"Capital of France?": [1.0, 0.0], "France's capital?": [0.99, 0.05]}
+    cache = LLMCache(embed=lambda prompt: vectors.get(prompt, [0.0, 1.0]))
+    cache.set("m1", "Capital of France?", {}, "Paris")
+
+    assert cache.get("m1", "France's capital?", {}) == "Paris"
+    assert cache.get("m1", "Something else", {}) is None
+    assert cache.get("m2", "France's capital?", {}) is None
+
+
+def test_cache_llm_cache_3():
+    """Test identical concurrent requests share one provider call"""
+    cache = LLMCache()
+    started = threading.Event()
+    release = threading.Event()
+    calls = []
+
+    def generate():
+        calls.append(1)
+        started.set()
+        release.wait(timeout=5)
+        return "4"
+
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        first = executor.submit(cache.get_or_generate, "m1", "2+2?", {}, generate)
+        started.wait(timeout=5)
+        second = executor.submit(cache.get_or_generate, "m1", "2+2?", {}, generate)
+        # Give the second caller time to find the in-flight request
+        time.sleep(0.05)
+        release.set()
+        assert first.result() == second.result() == "4"
+
+    assert len(calls) == 1
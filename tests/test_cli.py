@@ -0,0 +1,49 @@
+from PAI.cli import _parse_params
+
+
+def test_cli_parse_params_1():
+    """Test params are converted to booleans, ints, floats or left as strings"""
+    kwargs = _parse_params(
+        [
+            "stream=True",
+            "echo=false",
+            "max_tokens=100",
+            "offset=-2",
+            "temperature=0.7",
+            "top_p=.9",
+            "stop=a=b",
+            "model=gpt-4.1",
+        ]
+    )
+
+    assert kwargs == {
+        "stream": True,
+        "echo": False,
+        "max_tokens": 100,
+        "offset": -2,
+        "temperature": 0.7,
+        "top_p": 0.9,
+        "stop": "a=b",
+        "model": "gpt-4.1",
+    }
+
+
+def test_cli_parse_params_2(capsys):
+    """Test params without a name=value form are reported and skipped"""
+    assert _parse_params(["novalue", "n=1"]) == {"n": 1}
+    assert "Invalid parameter format: novalue" in capsys.readouterr().err
+
+
+def test_cli_providers_1():
+    """Test providers lists every registered provider"""
+    from typer.testing import CliRunner
+
+    from PAI.cli import app
+    from PAI.models.model_registry import ProviderRegistry
+
+    result = CliRunner().invoke(app, ["providers"])
+
+    assert result.exit_code == 0
+    assert result.output.startswith("Available Providers:\n")
+    for provider in ProviderRegistry.get_registered_providers():
+        assert f"   - {provider}\n" in result.output
@@ -0,0 +1,72 @@
+from PAI.contextmanager import ContextManager
+from PAI.tools.tool_registry import ToolRegistry
+
+
+def _session_log():
+    return {
+        "session_name": "Test_Session",
+        "session_instance": [
+            {
+                "tool_metadata": [{"name": "sum2num", "description": "Adds 2 numbers"}],
+                "resource_metadata": [],
+                "prompt_history": [],
+            }
+        ],
+    }
+
+
+def test_contextmanager_create_prompt_context_1():
+    """Test the prompt context lists the session's tools"""
+    context = ContextManager()
+    prompt_context = context.create_prompt_context(_session_log())
+
+    assert "Capabilities banner" in prompt_context
+    assert "sum2num" in prompt_context
+
+
+def test_contextmanager_create_prompt_context_2():
+    """Test the tool JSON is reused until the tool registry changes"""
+    ToolRegistry._tools = {}
+
+    @ToolRegistry.register("sum2num", "Adds 2 numbers")
+    def sum2num(a, b):
+        return a + b
+
+    context = ContextManager()
+    session_log = _session_log()
+    session_log["session_instance"][-1]["tool_metadata"] = ToolRegistry.get_tools()
+    context.create_prompt_context(session_log)
+    cached = context._json_cache["tools"][1]
+
+    context.create_prompt_context(session_log)
+    assert context._json_cache["tools"][1] is cached
+
+    @ToolRegistry.register("mul2num", "Multiplies 2 numbers")
+    def mul2num(a, b):
+        return a * b
+
+    session_log["session_instance"][-1]["tool_metadata"] = ToolRegistry.get_tools()
+    assert "mul2num" in context.create_prompt_context(session_log)
+
+
+def test_contextmanager_create_prompt_context_3():
+    """Test a session's own tool list is reserialized after an in-place edit"""
+    context = ContextManager()
+    session_log = _session_log()
+    context.create_prompt_context(session_log)
+
+    tools = session_log["session_instance"][-1]["tool_metadata"]
+    tools[0]["description"] = "Sums 2 numbers"
+    assert "Sums 2 numbers" in context.create_prompt_context(session_log)
+
+
+def test_contextmanager_build_next_prompt_1():
+    """Test tool results with int keys or integers beyond 64 bits are serialized"""
+    context = ContextManager()
+    prompt = context.build_next_prompt(
+        "q", [{"func_results": 2**64}, {"func_results": {1: "a"}}], []
+    )
+
+    assert str(2**64) in prompt
+    assert '"1": "a"' in prompt
+    assert prompt.endswith("Original question: q")
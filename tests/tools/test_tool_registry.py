@@ -148,3 +148,22 @@ def test_tool_registry_has_tools_1():
         pass
 
     assert ToolRegistry.has_tools()
+
+
+def test_tool_registry_get_tools_2():
+    """Test the tool list is reused until another tool is registered"""
+
+    ToolRegistry._tools = {}
+
+    @ToolRegistry.register("tool1", "Tool 1 description")
+    def tool1_func():
+        pass
+
+    tools = ToolRegistry.get_tools()
+    assert ToolRegistry.get_tools() is tools
+
+    @ToolRegistry.register("tool2", "Tool 2 description")
+    def tool2_func():
+        pass
+
+    assert len(ToolRegistry.get_tools()) == 2
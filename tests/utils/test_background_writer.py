@@ -0,0 +1,36 @@
+import os
+
+import pytest
+
+from PAI.utils.background_writer import BackgroundWriter
+
+
+def test_background_writer_flush_1(tmp_path):
+    """Test a failed write is raised from the next flush, once"""
+    writer = BackgroundWriter()
+    writer.append(tmp_path / "missing" / "log.jsonl", b"lost\n")
+
+    with pytest.raises(FileNotFoundError):
+        writer.flush()
+    writer.flush()
+
+    path = tmp_path / "log.jsonl"
+    writer.append(path, b"kept\n")
+    writer.close()
+    assert path.read_bytes() == b"kept\n"
+
+
+def test_background_writer_append_1(tmp_path):
+    """Test appends after the file is replaced go to the new file"""
+    path = tmp_path / "log.jsonl"
+    writer = BackgroundWriter()
+    writer.append(path, b"old\n")
+    writer.flush()
+
+    tmp = tmp_path / "log.jsonl.tmp"
+    tmp.write_bytes(b"new\n")
+    os.replace(tmp, path)
+    writer.append(path, b"more\n")
+    writer.close()
+
+    assert path.read_bytes() == b"new\nmore\n"
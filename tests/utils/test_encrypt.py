@@ -0,0 +1,15 @@
+from cryptography.fernet import Fernet
+
+from PAI.utils.encrypt import encrypt_api_key, decrypt_api_key
+
+
+def test_encrypt_api_key_1(monkeypatch):
+    """Test keys round-trip and a new PAI_ENCRYPTION_KEY is picked up"""
+    monkeypatch.setenv("PAI_ENCRYPTION_KEY", Fernet.generate_key().decode())
+    encrypted = encrypt_api_key("secret-key")
+    assert encrypted != "secret-key"
+    assert decrypt_api_key(encrypted) == "secret-key"
+
+    new_key = Fernet.generate_key()
+    monkeypatch.setenv("PAI_ENCRYPTION_KEY", new_key.decode())
+    assert Fernet(new_key).decrypt(encrypt_api_key("other").encode()) == b"other"
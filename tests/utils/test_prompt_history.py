@@ -0,0 +1,41 @@
+from PAI.utils.json_io import dumps
+from PAI.utils.prompt_history import PromptHistory
+
+
+def test_prompt_history_load_1(tmp_path):
+    """Test only the given instance's records are indexed, in order"""
+    path = tmp_path / "history.jsonl"
+    lines = [
+        {"session_start_dt": "t1", "prompt": "old", "response": "a"},
+        {"session_start_dt": "t2", "prompt": "first", "response": "b"},
+        {"session_start_dt": "t2", "prompt": "second", "response": "c"},
+    ]
+    path.write_bytes(b"".join(dumps(line) + b"\n" for line in lines))
+
+    history = PromptHistory.load(path, "t2")
+
+    assert len(history) == 2
+    assert history[0] == {"prompt": "first", "response": "b"}
+    assert history[-1]["prompt"] == "second"
+    assert [h["response"] for h in history[:]] == ["b", "c"]
+
+
+def test_prompt_history_append_1(tmp_path):
+    """Test appended records follow the indexed ones and missing files load empty"""
+    history = PromptHistory.load(tmp_path / "missing.jsonl", "t1")
+    assert len(history) == 0
+
+    history.append({"prompt": "Hi", "response": "Hello"})
+    assert len(history) == 1
+    assert history[0]["response"] == "Hello"
+
+
+def test_prompt_history_load_2(tmp_path):
+    """Test a loaded history no longer depends on the file once load returns"""
+    path = tmp_path / "history.jsonl"
+    path.write_bytes(dumps({"session_start_dt": "t1", "prompt": "Hi"}) + b"\n")
+
+    history = PromptHistory.load(path, "t1")
+    path.unlink()
+
+    assert list(history.copy()) == [{"prompt": "Hi"}]